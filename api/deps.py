@@ -6,6 +6,9 @@ from database.session import get_db
 from core.security import decode_token
 from core.exceptions import AuthenticationException
 from models.user import User
+from utils.revocation import is_revoked
+from utils.metrics import timed_phase
+from utils.user_cache import cache_user, get_cached_user, user_cache_generation
 from typing import Optional
 from uuid import UUID
 
@@ -17,7 +20,11 @@ async def get_current_user(
     db: AsyncSession = Depends(get_db)
 ) -> User:
     """Dependency to get current authenticated user."""
-    token = credentials.credentials
+    with timed_phase("auth"):
+        return await _authenticate(credentials.credentials, db)
+
+
+async def _authenticate(token: str, db: AsyncSession) -> User:
     payload = decode_token(token)
     
     if payload is None:
@@ -26,6 +33,9 @@ async def get_current_user(
     if payload.get("type") != "access":
         raise AuthenticationException("Invalid token type")
     
+    if is_revoked(payload):
+        raise AuthenticationException("Token has been revoked")
+    
     user_id_str = payload.get("sub")
     if user_id_str is None:
         raise AuthenticationException("Token missing user information")
@@ -35,10 +45,20 @@ async def get_current_user(
     except ValueError:
         raise AuthenticationException("Invalid user ID in token")
     
+    # Lets the session route this user's reads (see database.session.RoutingSession)
+    db.info["user_id"] = user_id
+    
+    cached = get_cached_user(user_id)
+    if cached is not None:
+        # Attach the cached row to this session without a round trip
+        return await db.merge(cached, load=False)
+    
+    generation = user_cache_generation()
     result = await db.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     
     if user is None:
         raise AuthenticationException("User not found")
     
+    cache_user(user, generation)
     return user
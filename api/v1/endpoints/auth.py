@@ -1,13 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from database.session import get_db
+from typing import Optional
+from uuid import UUID
+from api.deps import security
+from database.session import get_db, stick_to_primary
 from schemas.user import UserCreate, UserResponse
-from schemas.auth import LoginRequest, TokenResponse, RefreshTokenRequest
+from schemas.auth import LoginRequest, TokenResponse, RefreshTokenRequest, LogoutRequest
 from models.user import User
 from core.security import (
-    hash_password,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
+    password_needs_rehash,
     create_access_token,
     create_refresh_token,
     decode_token
@@ -15,12 +20,17 @@ from core.security import (
 from core.exceptions import ConflictException, AuthenticationException
 from config.settings import settings
 from utils.rate_limiter import limiter
+from utils.revocation import is_revoked, revoke_token
+from utils.user_cache import invalidate_user
+from utils.metrics import TimedRoute
+from utils.query_budget import query_budget
 
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("/register", response_model=dict, status_code=status.HTTP_201_CREATED)
+@query_budget(4)
 @limiter.limit(f"{settings.LOGIN_RATE_LIMIT}/hour")
 async def register(
     request: Request,
@@ -39,7 +49,7 @@ async def register(
         raise ConflictException("Email already registered")
     
     # Create new user
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await hash_password_async(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -60,6 +70,7 @@ async def register(
 
 
 @router.post("/login", response_model=TokenResponse)
+@query_budget(2)
 @limiter.limit(f"{settings.LOGIN_RATE_LIMIT}/15 minutes")
 async def login(
     request: Request,
@@ -71,9 +82,18 @@ async def login(
     result = await db.execute(select(User).where(User.email == login_data.email))
     user = result.scalar_one_or_none()
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    if not user or not await verify_password_async(login_data.password, user.password_hash):
         raise AuthenticationException("Incorrect email or password")
     
+    # Move hashes made at an old cost factor to the current one
+    if password_needs_rehash(user.password_hash):
+        user.password_hash = await hash_password_async(login_data.password)
+        await db.commit()
+        invalidate_user(user.id)
+    
+    # The user's first requests may beat replication of a fresh account
+    stick_to_primary(user.id)
+    
     # Create tokens
     access_token = create_access_token(data={"sub": str(user.id)})
     refresh_token = create_refresh_token(data={"sub": str(user.id)})
@@ -94,6 +114,7 @@ async def login(
 
 
 @router.post("/refresh", response_model=dict)
+@query_budget(0)
 async def refresh_token(
     refresh_data: RefreshTokenRequest,
     db: AsyncSession = Depends(get_db)
@@ -107,6 +128,9 @@ async def refresh_token(
     if payload.get("type") != "refresh":
         raise AuthenticationException("Invalid token type")
     
+    if is_revoked(payload):
+        raise AuthenticationException("Token has been revoked")
+    
     user_id = payload.get("sub")
     if user_id is None:
         raise AuthenticationException("Token missing user information")
@@ -122,6 +146,31 @@ async def refresh_token(
 
 
 @router.post("/logout")
-async def logout():
-    """Logout user (client should discard tokens)."""
+@query_budget(4)
+async def logout(
+    logout_data: Optional[LogoutRequest] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+):
+    """Logout user by revoking the access token and, if given, the refresh token."""
+    payload = decode_token(credentials.credentials)
+    if payload is None or payload.get("type") != "access":
+        raise AuthenticationException("Invalid token")
+    
+    try:
+        user_id = UUID(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise AuthenticationException("Invalid user ID in token")
+    
+    await revoke_token(db, payload, user_id)
+    
+    if logout_data and logout_data.refresh_token:
+        refresh_payload = decode_token(logout_data.refresh_token)
+        if (
+            refresh_payload is not None
+            and refresh_payload.get("type") == "refresh"
+            and refresh_payload.get("sub") == payload.get("sub")
+        ):
+            await revoke_token(db, refresh_payload, user_id)
+    
     return {"message": "Successfully logged out"}
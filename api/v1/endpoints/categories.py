@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, delete
+from sqlalchemy.exc import IntegrityError
 from database.session import get_db
 from api.deps import get_current_user
 from models.user import User
 from models.category import Category
 from schemas.category import CategoryCreate, CategoryUpdate, CategoryResponse
 from core.exceptions import NotFoundException, ForbiddenException, ConflictException
+from utils.count_cache import invalidate_user_counts
+from utils.versioning import bump_data_version, check_etag, get_data_version
+from utils.tombstones import record_tombstones
+from utils.task_stats import apply_task_stat_deltas, NO_CATEGORY
+from models.task_stat import TaskStat
 from uuid import UUID
+from utils.metrics import TimedRoute
+from utils.query_budget import query_budget
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.post("", response_model=CategoryResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(5)
 async def create_category(
     category_data: CategoryCreate,
     current_user: User = Depends(get_current_user),
@@ -37,6 +46,7 @@ async def create_category(
     )
     
     db.add(new_category)
+    await bump_data_version(db, current_user.id)
     await db.commit()
     await db.refresh(new_category)
     
@@ -44,11 +54,19 @@ async def create_category(
 
 
 @router.get("", response_model=list[CategoryResponse])
+@query_budget(3)
 async def list_categories(
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """List all categories for authenticated user."""
+    data_version = await get_data_version(db, current_user.id)
+    not_modified = check_etag(current_user.id, data_version, request, response)
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(
         select(Category).where(Category.user_id == current_user.id).order_by(Category.name)
     )
@@ -58,12 +76,20 @@ async def list_categories(
 
 
 @router.get("/{category_id}", response_model=CategoryResponse)
+@query_budget(3)
 async def get_category(
     category_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific category by ID."""
+    data_version = await get_data_version(db, current_user.id)
+    not_modified = check_etag(current_user.id, data_version, request, response)
+    if not_modified:
+        return not_modified
+    
     result = await db.execute(select(Category).where(Category.id == category_id))
     category = result.scalar_one_or_none()
     
@@ -77,61 +103,100 @@ async def get_category(
 
 
 @router.patch("/{category_id}", response_model=CategoryResponse)
+@query_budget(4)
 async def update_category(
     category_id: UUID,
     category_data: CategoryUpdate,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update a category."""
-    result = await db.execute(select(Category).where(Category.id == category_id))
-    category = result.scalar_one_or_none()
+    """Update a category.
     
-    if not category:
-        raise NotFoundException("Category not found")
+    Ownership is checked by the UPDATE itself and name clashes by the
+    (user_id, name) unique constraint; the row is only probed again on a
+    miss, to tell 404 from 403.
+    """
+    owned = (Category.id == category_id, Category.user_id == current_user.id)
     
-    if category.user_id != current_user.id:
-        raise ForbiddenException("You don't have permission to update this category")
+    # Update only provided fields; name can't be cleared
+    update_data = category_data.model_dump(exclude_unset=True)
+    if update_data.get("name", "") is None:
+        del update_data["name"]
+    
+    if not update_data:
+        result = await db.execute(select(Category).where(*owned))
+        category = result.scalar_one_or_none()
+        if category is None:
+            await _raise_category_miss(db, category_id, "update")
+        return category
     
-    # Check for name conflict if name is being updated
-    if category_data.name and category_data.name != category.name:
+    try:
         result = await db.execute(
-            select(Category).where(
-                Category.user_id == current_user.id,
-                Category.name == category_data.name
-            )
+            update(Category)
+            .where(*owned)
+            .values(**update_data)
+            .returning(Category)
+            .execution_options(synchronize_session=False)
         )
-        if result.scalar_one_or_none():
-            raise ConflictException("Category with this name already exists")
+    except IntegrityError:
+        await db.rollback()
+        raise ConflictException("Category with this name already exists")
     
-    # Update only provided fields
-    update_data = category_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(category, field, value)
+    category = result.scalar_one_or_none()
+    if category is None:
+        await _raise_category_miss(db, category_id, "update")
     
+    await bump_data_version(db, current_user.id)
     await db.commit()
-    await db.refresh(category)
     
     return category
 
 
 @router.delete("/{category_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(6)
 async def delete_category(
     category_id: UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a category."""
-    result = await db.execute(select(Category).where(Category.id == category_id))
-    category = result.scalar_one_or_none()
+    """Delete a category with a single ownership-checked DELETE.
     
-    if not category:
-        raise NotFoundException("Category not found")
+    Its tasks become uncategorized through the ON DELETE SET NULL foreign key.
+    """
+    result = await db.execute(
+        delete(Category)
+        .where(Category.id == category_id, Category.user_id == current_user.id)
+        .returning(Category.id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.scalar_one_or_none() is None:
+        await _raise_category_miss(db, category_id, "delete")
     
-    if category.user_id != current_user.id:
-        raise ForbiddenException("You don't have permission to delete this category")
+    # Move the category's task count over to "none"
+    result = await db.execute(
+        delete(TaskStat)
+        .where(
+            TaskStat.user_id == current_user.id,
+            TaskStat.dimension == "category",
+            TaskStat.key == str(category_id)
+        )
+        .returning(TaskStat.count)
+    )
+    moved = result.scalar_one_or_none() or 0
+    await apply_task_stat_deltas(db, current_user.id, {("category", NO_CATEGORY): moved})
     
-    await db.delete(category)
+    await record_tombstones(db, current_user.id, "category", [category_id])
+    await bump_data_version(db, current_user.id)
     await db.commit()
+    # Tasks in the category fall back to no category
+    invalidate_user_counts(current_user.id)
     
     return None
+
+
+async def _raise_category_miss(db: AsyncSession, category_id: UUID, action: str) -> None:
+    """Raise 404 or 403 after an ownership-checked statement matched no row."""
+    result = await db.execute(select(Category.id).where(Category.id == category_id))
+    if result.scalar_one_or_none() is None:
+        raise NotFoundException("Category not found")
+    raise ForbiddenException(f"You don't have permission to {action} this category")
@@ -1,20 +1,71 @@
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, or_
-from database.session import get_db
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy import select, func, insert, update, delete
+from sqlalchemy.orm import joinedload, selectinload
+from database.session import get_db, get_session_factory
 from api.deps import get_current_user
 from models.user import User
-from models.task import Task, TaskStatus, TaskPriority
-from schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskListResponse
-from core.exceptions import NotFoundException, ForbiddenException
-from typing import Optional
-from uuid import UUID
+from models.task import Task, TaskStatus, TaskPriority, PRIORITY_RANKS
+from models.category import Category
+from schemas.task import (
+    TaskCreate,
+    TaskUpdate,
+    TaskResponse,
+    TaskListResponse,
+    TaskBatchRequest,
+    TaskBatchResponse,
+    TaskBatchItemResult,
+    TaskChangesResponse,
+    TaskImportResponse,
+    TaskImportError,
+    TaskStatsResponse
+)
+from pydantic import ValidationError
+from models.tombstone import Tombstone
+from core.exceptions import NotFoundException, ForbiddenException, BadRequestException, GoneException
+from utils.pagination import encode_cursor, decode_cursor, keyset_condition, keyset_order
+from utils.search import apply_task_search
+from utils.count_cache import get_cached_count, set_cached_count, invalidate_user_counts
+from utils.versioning import bump_data_version, check_etag, get_data_version
+from utils.tombstones import record_tombstones, retention_horizon
+from utils.streaming import iter_lines, iter_csv_records
+from utils.task_stats import add_task, remove_task, apply_task_stat_deltas, get_task_stats
+from config.settings import settings
+from typing import Optional, AsyncIterator, Union
+from uuid import UUID, uuid4
+from datetime import datetime, timedelta
 from math import ceil
+from collections import Counter
+from enum import Enum
+import csv
+import io
+import json
+from utils.metrics import TimedRoute
+from utils.query_budget import query_budget
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
+
+EXPORT_CSV_FIELDS = [
+    "id", "title", "description", "status", "priority", "due_date",
+    "category_id", "category_name", "created_at", "updated_at"
+]
+
+# Column order for COPY during imports; generated columns are left out
+IMPORT_COLUMNS = [
+    "id", "user_id", "category_id", "title", "description",
+    "status", "priority", "due_date", "created_at", "updated_at"
+]
+
+# Fields that feed the per-user task counters
+TASK_STAT_FIELDS = {"status", "priority", "category_id"}
+
+# Most per-line errors reported back from an import
+MAX_IMPORT_ERRORS = 100
 
 
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
+@query_budget(6)
 async def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_user),
@@ -32,52 +83,394 @@ async def create_task(
     )
     
     db.add(new_task)
+    deltas = Counter()
+    add_task(deltas, new_task.status, new_task.priority, new_task.category_id)
+    await apply_task_stat_deltas(db, current_user.id, deltas)
+    await bump_data_version(db, current_user.id)
     await db.commit()
+    invalidate_user_counts(current_user.id)
     await db.refresh(new_task, ["category"])
     
     return new_task
 
 
+@router.post("/batch", response_model=TaskBatchResponse)
+@query_budget(12)
+async def batch_tasks(
+    batch: TaskBatchRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply many task creates, updates and deletes in one transaction.
+    
+    Each operation gets its own result with an HTTP status code. Operations
+    that reference missing or foreign tasks/categories are reported and
+    skipped; the rest are applied with one statement per operation type.
+    """
+    results: list[Optional[TaskBatchItemResult]] = [None] * len(batch.operations)
+    
+    def reject(index: int, operation, code: int, error: str) -> None:
+        results[index] = TaskBatchItemResult(
+            index=index,
+            op=operation.op,
+            status=code,
+            id=getattr(operation, "id", None),
+            error=error
+        )
+    
+    # Resolve ownership of every referenced task and category up front,
+    # locking the tasks so the counter deltas below match what is changed
+    task_ids = {op.id for op in batch.operations if op.op != "create"}
+    existing = {}
+    if task_ids:
+        result = await db.execute(
+            select(Task.id, Task.user_id, Task.status, Task.priority, Task.category_id)
+            .where(Task.id.in_(task_ids))
+            .with_for_update()
+        )
+        existing = {row.id: row for row in result.all()}
+    
+    category_ids = {
+        op.data.category_id for op in batch.operations
+        if op.op != "delete" and op.data.category_id is not None
+    }
+    own_categories = set()
+    if category_ids:
+        result = await db.execute(
+            select(Category.id).where(
+                Category.id.in_(category_ids),
+                Category.user_id == current_user.id
+            )
+        )
+        own_categories = set(result.scalars().all())
+    
+    creates, updates, deletes = [], [], []
+    seen_ids = set()
+    for index, operation in enumerate(batch.operations):
+        if operation.op != "create":
+            row = existing.get(operation.id)
+            if row is None:
+                reject(index, operation, status.HTTP_404_NOT_FOUND, "Task not found")
+                continue
+            if row.user_id != current_user.id:
+                reject(index, operation, status.HTTP_403_FORBIDDEN, "You don't have permission to modify this task")
+                continue
+            if operation.id in seen_ids:
+                reject(index, operation, status.HTTP_400_BAD_REQUEST, "Task appears more than once in batch")
+                continue
+            seen_ids.add(operation.id)
+        
+        if operation.op != "delete":
+            category_id = operation.data.category_id
+            if category_id is not None and category_id not in own_categories:
+                reject(index, operation, status.HTTP_404_NOT_FOUND, "Category not found")
+                continue
+        
+        {"create": creates, "update": updates, "delete": deletes}[operation.op].append((index, operation))
+    
+    # Counter changes for the whole batch, applied in one statement
+    deltas = Counter()
+    for _, operation in creates:
+        add_task(deltas, operation.data.status, operation.data.priority, operation.data.category_id)
+    for _, operation in updates:
+        row = existing[operation.id]
+        changes = operation.data.model_dump(exclude_unset=True)
+        remove_task(deltas, row.status, row.priority, row.category_id)
+        add_task(
+            deltas,
+            changes.get("status", row.status),
+            changes.get("priority", row.priority),
+            changes.get("category_id", row.category_id)
+        )
+    
+    # Multi-row INSERT ... RETURNING, ids come back in parameter order
+    created_ids = []
+    if creates:
+        result = await db.execute(
+            insert(Task).returning(Task.id, sort_by_parameter_order=True),
+            [{"user_id": current_user.id, **operation.data.model_dump()} for _, operation in creates]
+        )
+        created_ids = result.scalars().all()
+    
+    # Bulk UPDATE by primary key, batched by the set of fields being changed
+    if updates:
+        now = datetime.utcnow()
+        await db.execute(
+            update(Task),
+            [
+                {"id": operation.id, **operation.data.model_dump(exclude_unset=True), "updated_at": now}
+                for _, operation in updates
+            ]
+        )
+    
+    # Deletes count only the rows the DELETE actually removed
+    deleted = {}
+    if deletes:
+        result = await db.execute(
+            delete(Task)
+            .where(
+                Task.id.in_([operation.id for _, operation in deletes]),
+                Task.user_id == current_user.id
+            )
+            .returning(Task.id, Task.status, Task.priority, Task.category_id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted = {row.id: row for row in result.all()}
+        for row in deleted.values():
+            remove_task(deltas, row.status, row.priority, row.category_id)
+        await record_tombstones(db, current_user.id, "task", list(deleted))
+    
+    if creates or updates or deletes:
+        await apply_task_stat_deltas(db, current_user.id, deltas)
+        await bump_data_version(db, current_user.id)
+    await db.commit()
+    if creates or updates or deletes:
+        invalidate_user_counts(current_user.id)
+    
+    # Load the written tasks with their categories in one round trip
+    written_ids = list(created_ids) + [operation.id for _, operation in updates]
+    tasks = {}
+    if written_ids:
+        result = await db.execute(
+            select(Task)
+            .options(joinedload(Task.category))
+            .where(Task.id.in_(written_ids))
+            .execution_options(populate_existing=True)
+        )
+        tasks = {task.id: task for task in result.scalars().all()}
+    
+    for (index, operation), task_id in zip(creates, created_ids):
+        results[index] = TaskBatchItemResult(
+            index=index, op="create", status=status.HTTP_201_CREATED, id=task_id, task=tasks[task_id]
+        )
+    for index, operation in updates:
+        results[index] = TaskBatchItemResult(
+            index=index, op="update", status=status.HTTP_200_OK, id=operation.id, task=tasks[operation.id]
+        )
+    for index, operation in deletes:
+        if operation.id not in deleted:
+            reject(index, operation, status.HTTP_404_NOT_FOUND, "Task not found")
+            continue
+        results[index] = TaskBatchItemResult(
+            index=index, op="delete", status=status.HTTP_204_NO_CONTENT, id=operation.id
+        )
+    
+    return TaskBatchResponse(results=results)
+
+
+@router.post("/import", response_model=TaskImportResponse)
+@query_budget(None, allow_repeats=True)
+async def import_tasks(
+    request: Request,
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Bulk-import tasks from a streamed NDJSON or CSV body.
+    
+    Each NDJSON line or CSV record is validated against ``TaskCreate`` as it
+    arrives, and valid rows are inserted in batches of ``IMPORT_BATCH_SIZE``
+    (COPY on Postgres, executemany elsewhere), each committed on its own, so
+    memory does not grow with the size of the upload. Records longer than
+    ``IMPORT_MAX_RECORD_LENGTH`` characters are reported as failed lines. Unknown fields and
+    columns are ignored, so an export can be imported as-is.
+    """
+    result = await db.execute(select(Category.id).where(Category.user_id == current_user.id))
+    own_categories = set(result.scalars().all())
+    
+    summary = TaskImportResponse(imported=0, failed=0, errors=[])
+    
+    def fail(line: int, error: str) -> None:
+        summary.failed += 1
+        if len(summary.errors) < MAX_IMPORT_ERRORS:
+            summary.errors.append(TaskImportError(line=line, error=error))
+        else:
+            summary.errors_truncated = True
+    
+    now = datetime.utcnow()
+    batch = []
+    async for line_number, record in _import_records(request, format):
+        if isinstance(record, str):
+            fail(line_number, record)
+            continue
+        
+        try:
+            task_data = TaskCreate.model_validate(record)
+        except ValidationError as exc:
+            fail(line_number, "; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                for error in exc.errors()
+            ))
+            continue
+        
+        if task_data.category_id is not None and task_data.category_id not in own_categories:
+            fail(line_number, "Category not found")
+            continue
+        
+        batch.append({
+            "id": uuid4(),
+            "user_id": current_user.id,
+            "created_at": now,
+            "updated_at": now,
+            **task_data.model_dump()
+        })
+        if len(batch) >= settings.IMPORT_BATCH_SIZE:
+            await _insert_import_batch(db, current_user.id, batch)
+            summary.imported += len(batch)
+            batch = []
+    
+    if batch:
+        await _insert_import_batch(db, current_user.id, batch)
+        summary.imported += len(batch)
+    
+    if summary.imported:
+        invalidate_user_counts(current_user.id)
+    
+    return summary
+
+
+async def _import_records(
+    request: Request,
+    format: str
+) -> AsyncIterator[tuple[int, Union[dict, str]]]:
+    """Yield (line number, field dict) per record, or an error message."""
+    lines = iter_lines(request.stream(), settings.IMPORT_MAX_RECORD_LENGTH)
+    
+    if format == "ndjson":
+        line_number = 0
+        async for line in lines:
+            line_number += 1
+            if line is None:
+                yield line_number, "Record too long"
+                continue
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield line_number, "Invalid JSON"
+                continue
+            if not isinstance(record, dict):
+                yield line_number, "Expected a JSON object"
+                continue
+            yield line_number, record
+        return
+    
+    header = None
+    async for line_number, fields in iter_csv_records(lines, settings.IMPORT_MAX_RECORD_LENGTH):
+        if isinstance(fields, str):
+            yield line_number, fields
+            continue
+        if header is None:
+            header = [name.strip() for name in fields]
+            continue
+        if len(fields) != len(header):
+            yield line_number, f"Expected {len(header)} columns, got {len(fields)}"
+            continue
+        # Empty cells mean "not set" so schema defaults apply
+        yield line_number, {name: value for name, value in zip(header, fields) if value != ""}
+
+
+async def _insert_import_batch(db: AsyncSession, user_id: UUID, rows: list[dict]) -> None:
+    """Insert and commit one batch of imported tasks."""
+    # Counters first: their statements open the connection's transaction, which
+    # a COPY on the raw asyncpg connection would otherwise run outside of
+    deltas = Counter()
+    for row in rows:
+        add_task(deltas, row["status"], row["priority"], row["category_id"])
+    await apply_task_stat_deltas(db, user_id, deltas)
+    await bump_data_version(db, user_id)
+    
+    if db.bind.dialect.driver == "asyncpg":
+        connection = await db.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "tasks",
+            columns=IMPORT_COLUMNS,
+            records=[
+                tuple(
+                    row[column].value if isinstance(row[column], Enum) else row[column]
+                    for column in IMPORT_COLUMNS
+                )
+                for row in rows
+            ]
+        )
+    else:
+        await db.execute(insert(Task), rows)
+    await db.commit()
+
+
 @router.get("", response_model=TaskListResponse)
+@query_budget(5)
 async def list_tasks(
-    page: int = Query(1, ge=1),
+    request: Request,
+    response: Response,
+    page: Optional[int] = Query(None, ge=1),
+    cursor: Optional[str] = None,
     limit: int = Query(20, ge=1, le=100),
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
     category_id: Optional[UUID] = None,
-    sort_by: str = Query("created_at", regex="^(created_at|due_date|priority)$"),
+    sort_by: Optional[str] = Query(None, regex="^(created_at|due_date|priority|relevance)$"),
     order: str = Query("desc", regex="^(asc|desc)$"),
     search: Optional[str] = None,
+    count: Optional[str] = Query(None, regex="^(none|estimate|exact)$"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """List all tasks for authenticated user with filtering and pagination."""
-    # Build query
-    query = select(Task).where(Task.user_id == current_user.id)
+    """List all tasks for authenticated user with filtering and pagination.
     
-    # Apply filters
-    if status:
-        query = query.where(Task.status == status)
-    if priority:
-        query = query.where(Task.priority == priority)
-    if category_id:
-        query = query.where(Task.category_id == category_id)
-    if search:
-        search_term = f"%{search}%"
-        query = query.where(
-            or_(
-                Task.title.ilike(search_term),
-                Task.description.ilike(search_term)
-            )
-        )
+    Pages are addressed by an opaque ``cursor`` by default; passing ``page``
+    switches to offset pagination. ``count`` controls the total: ``none``
+    skips it, ``estimate`` counts at most ``COUNT_ESTIMATE_LIMIT`` rows and
+    ``exact`` counts everything. Cursor pages default to ``none`` and offset
+    pages to ``exact``.
+    
+    ``search`` uses the full-text index and sorts by relevance unless another
+    ``sort_by`` is requested.
+    
+    Responses carry an ETag; a matching ``If-None-Match`` gets a 304 without
+    running the list or count queries.
+    """
+    if page is not None and cursor is not None:
+        raise BadRequestException("Use either page or cursor, not both")
+    
+    data_version = await get_data_version(db, current_user.id)
+    not_modified = check_etag(current_user.id, data_version, request, response)
+    if not_modified:
+        return not_modified
+    
+    if count is None:
+        count = "none" if page is None else "exact"
+    
+    query, rank = _filter_tasks(
+        current_user.id, status, priority, category_id, search, db.bind.dialect.name
+    )
     
     # Get total count
-    count_query = select(func.count()).select_from(query.subquery())
-    total_result = await db.execute(count_query)
-    total_items = total_result.scalar()
+    filters = (data_version, status, priority, category_id, search)
+    total_items, total_exact = await _count_tasks(db, query, current_user.id, filters, count)
+    
+    # Resolve the sort column
+    if sort_by is None:
+        sort_by = "relevance" if rank is not None else "created_at"
+    if sort_by == "relevance":
+        if rank is None:
+            raise BadRequestException("Sorting by relevance requires a search term")
+        order_column = rank
+    elif sort_by == "priority":
+        order_column = Task.priority_rank
+    else:
+        order_column = getattr(Task, sort_by)
+    
+    if page is None:
+        listing = await _list_tasks_keyset(db, query, cursor, limit, sort_by, order_column, order)
+        if count != "none":
+            listing.pagination["totalItems"] = total_items
+            listing.pagination["totalItemsExact"] = total_exact
+        return listing
     
     # Apply sorting
-    order_column = getattr(Task, sort_by)
     if order == "desc":
         query = query.order_by(order_column.desc())
     else:
@@ -85,14 +478,16 @@ async def list_tasks(
     
     # Apply pagination
     offset = (page - 1) * limit
-    query = query.offset(offset).limit(limit)
+    query = query.offset(offset).limit(limit).options(joinedload(Task.category))
     
     # Execute query
     result = await db.execute(query)
     tasks = result.scalars().all()
     
     # Calculate pagination metadata
-    total_pages = ceil(total_items / limit) if total_items > 0 else 0
+    total_pages = None
+    if total_items is not None:
+        total_pages = ceil(total_items / limit) if total_items > 0 else 0
     
     return TaskListResponse(
         tasks=tasks,
@@ -100,19 +495,348 @@ async def list_tasks(
             "currentPage": page,
             "totalPages": total_pages,
             "totalItems": total_items,
+            "totalItemsExact": total_exact,
             "itemsPerPage": limit
         }
     )
 
 
+def _filter_tasks(
+    user_id: UUID,
+    status: Optional[TaskStatus],
+    priority: Optional[TaskPriority],
+    category_id: Optional[UUID],
+    search: Optional[str],
+    dialect: str
+):
+    """Build the filtered task query shared by listing and export.
+    
+    Returns the query and a relevance expression, which is ``None`` unless
+    ``search`` is served by a full-text index.
+    """
+    query = select(Task).where(Task.user_id == user_id)
+    
+    if status:
+        query = query.where(Task.status == status)
+    if priority:
+        query = query.where(Task.priority_rank == PRIORITY_RANKS[priority])
+    if category_id:
+        query = query.where(Task.category_id == category_id)
+    
+    rank = None
+    if search:
+        query, rank = apply_task_search(query, search, dialect)
+    
+    return query, rank
+
+
+async def _count_tasks(
+    db: AsyncSession,
+    query,
+    user_id: UUID,
+    filters: tuple,
+    mode: str
+) -> tuple[Optional[int], bool]:
+    """Return (total, is_exact) for a filtered task query.
+    
+    Totals are served from the per-user count cache when possible; otherwise
+    ``exact`` runs a full COUNT and ``estimate`` stops counting at
+    ``COUNT_ESTIMATE_LIMIT`` rows.
+    """
+    if mode == "none":
+        return None, False
+    
+    cached = get_cached_count(user_id, filters)
+    if cached is not None:
+        return cached, True
+    
+    if mode == "estimate":
+        bound = settings.COUNT_ESTIMATE_LIMIT
+        bounded = query.with_only_columns(Task.id).limit(bound)
+        result = await db.execute(select(func.count()).select_from(bounded.subquery()))
+        total = result.scalar()
+        if total < bound:
+            set_cached_count(user_id, filters, total)
+            return total, True
+        return total, False
+    
+    result = await db.execute(select(func.count()).select_from(query.subquery()))
+    total = result.scalar()
+    set_cached_count(user_id, filters, total)
+    return total, True
+
+
+async def _list_tasks_keyset(
+    db: AsyncSession,
+    query,
+    cursor: Optional[str],
+    limit: int,
+    sort_by: str,
+    order_column,
+    order: str
+) -> TaskListResponse:
+    """Fetch one page after ``cursor`` ordered by (order_column, id)."""
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_by)
+        if value is not None:
+            try:
+                if sort_by == "priority":
+                    value = int(value)
+                elif sort_by == "relevance":
+                    value = float(value)
+                else:
+                    value = datetime.fromisoformat(value)
+            except (ValueError, TypeError):
+                raise BadRequestException("Invalid cursor")
+        query = query.where(keyset_condition(order_column, Task.id, value, last_id, order))
+    
+    query = query.order_by(*keyset_order(order_column, Task.id, order))
+    
+    # Fetch one extra row to know whether another page exists, selecting the
+    # sort key alongside each task so computed keys like relevance can be
+    # carried into the cursor
+    result = await db.execute(
+        query.add_columns(order_column)
+        .options(joinedload(Task.category))
+        .limit(limit + 1)
+    )
+    rows = result.all()
+    tasks = [row[0] for row in rows[:limit]]
+    
+    next_cursor = None
+    if len(rows) > limit:
+        last_task, last_value = rows[limit - 1]
+        next_cursor = encode_cursor(sort_by, last_value, last_task.id)
+    
+    return TaskListResponse(
+        tasks=tasks,
+        pagination={
+            "itemsPerPage": limit,
+            "nextCursor": next_cursor,
+            "hasMore": next_cursor is not None
+        }
+    )
+
+
+@router.get("/changes", response_model=TaskChangesResponse)
+@query_budget(5)
+async def list_task_changes(
+    request: Request,
+    response: Response,
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """List tasks created or updated after ``since``, plus deletions.
+    
+    Omit ``since`` for an initial sync of every task. Keep following
+    ``nextCursor`` while ``hasMore`` is true, then store it for the next
+    sync. Deletions older than the tombstone retention window can't be
+    replayed, so a stored cursor older than that gets a 410 and the client
+    must resync from scratch. Cursors returned while paging never expire.
+    A deleted category also clears ``category_id`` on its tasks without
+    touching their ``updated_at``.
+    """
+    data_version = await get_data_version(db, current_user.id)
+    not_modified = check_etag(current_user.id, data_version, request, response)
+    if not_modified:
+        return not_modified
+    
+    now = datetime.utcnow()
+    query = select(Task).where(Task.user_id == current_user.id)
+    
+    since_at = None
+    if since:
+        value, last_id = decode_cursor(since, "updated_at")
+        try:
+            since_at = datetime.fromisoformat(value)
+        except (ValueError, TypeError):
+            raise BadRequestException("Invalid cursor")
+        if last_id is None:
+            # Only caught-up cursors replay deletions from ``since_at``;
+            # paging cursors carry the last task's (possibly old) updated_at
+            if since_at < retention_horizon(now):
+                raise GoneException("Cursor is too old, a full resync is required")
+            query = query.where(Task.updated_at > since_at)
+        else:
+            query = query.where(keyset_condition(Task.updated_at, Task.id, since_at, last_id, "asc"))
+    
+    result = await db.execute(
+        query.options(joinedload(Task.category))
+        .order_by(*keyset_order(Task.updated_at, Task.id, "asc"))
+        .limit(limit + 1)
+    )
+    tasks = result.scalars().all()
+    
+    has_more = len(tasks) > limit
+    if has_more:
+        tasks = tasks[:limit]
+        until = tasks[-1].updated_at
+        next_cursor = encode_cursor("updated_at", until, tasks[-1].id)
+    else:
+        # Caught up: re-read a short overlap next time so writes committed
+        # late with an earlier timestamp are not missed
+        until = now
+        next_cursor = encode_cursor("updated_at", now - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS), None)
+    
+    deleted = []
+    if since_at is not None:
+        result = await db.execute(
+            select(Tombstone)
+            .where(
+                Tombstone.user_id == current_user.id,
+                Tombstone.deleted_at > since_at,
+                Tombstone.deleted_at <= until
+            )
+            .order_by(Tombstone.deleted_at)
+        )
+        deleted = result.scalars().all()
+    
+    return TaskChangesResponse(
+        tasks=tasks,
+        deleted=deleted,
+        pagination={
+            "nextCursor": next_cursor,
+            "hasMore": has_more
+        }
+    )
+
+
+@router.get("/export")
+@query_budget(3)
+async def export_tasks(
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    status: Optional[TaskStatus] = None,
+    priority: Optional[TaskPriority] = None,
+    category_id: Optional[UUID] = None,
+    search: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+    session_factory: async_sessionmaker = Depends(get_session_factory)
+):
+    """Stream all of the user's tasks as NDJSON or CSV.
+    
+    Accepts the same filters as listing. Rows are read through a server-side
+    cursor in batches of ``EXPORT_BATCH_SIZE``, so memory stays flat however
+    many tasks are exported.
+    """
+    query, _ = _filter_tasks(
+        current_user.id, status, priority, category_id, search, db.bind.dialect.name
+    )
+    query = (
+        query.options(joinedload(Task.category))
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    
+    if format == "csv":
+        media_type, filename = "text/csv", "tasks.csv"
+    else:
+        media_type, filename = "application/x-ndjson", "tasks.ndjson"
+    
+    # The request-scoped session is closed once this handler returns, so the
+    # stream reads through a session of its own
+    return StreamingResponse(
+        _stream_tasks(session_factory, query, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+async def _stream_tasks(
+    session_factory: async_sessionmaker,
+    query,
+    format: str
+) -> AsyncIterator[str]:
+    """Yield one chunk of serialized tasks per fetched batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    if format == "csv":
+        writer.writerow(EXPORT_CSV_FIELDS)
+        yield buffer.getvalue()
+    
+    async with session_factory() as session:
+        result = await session.stream(query)
+        async for partition in result.scalars().partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for task in partition:
+                if format == "csv":
+                    writer.writerow([
+                        task.id,
+                        task.title,
+                        task.description,
+                        task.status.value,
+                        task.priority.value,
+                        task.due_date.isoformat() if task.due_date else None,
+                        task.category_id,
+                        task.category.name if task.category else None,
+                        task.created_at.isoformat(),
+                        task.updated_at.isoformat()
+                    ])
+                else:
+                    buffer.write(TaskResponse.model_validate(task).model_dump_json())
+                    buffer.write("\n")
+            # Drop the batch from the identity map before fetching the next
+            session.expunge_all()
+            yield buffer.getvalue()
+
+
+@router.get("/stats", response_model=TaskStatsResponse)
+@query_budget(4)
+async def task_stats(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Task counts by status, priority and category, plus due-date counts.
+    
+    The grouped counts come from the per-user counters kept up to date by
+    every task write. Overdue and due-within-a-week counts depend on the
+    current time, so they are counted live from the (user, status, due
+    date) index, touching only the open tasks being counted.
+    """
+    stats = await get_task_stats(db, current_user.id)
+    
+    now = datetime.utcnow()
+    open_tasks = select(func.count()).select_from(Task).where(
+        Task.user_id == current_user.id,
+        Task.status.in_([TaskStatus.TODO, TaskStatus.IN_PROGRESS])
+    )
+    overdue = (await db.execute(open_tasks.where(Task.due_date < now))).scalar()
+    due_this_week = (await db.execute(
+        open_tasks.where(Task.due_date >= now, Task.due_date < now + timedelta(days=7))
+    )).scalar()
+    
+    return TaskStatsResponse(
+        total=sum(stats["status"].values()),
+        by_status={task_status.value: stats["status"].get(task_status.value, 0) for task_status in TaskStatus},
+        by_priority={task_priority.value: stats["priority"].get(task_priority.value, 0) for task_priority in TaskPriority},
+        by_category=stats["category"],
+        overdue=overdue,
+        due_this_week=due_this_week
+    )
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
+@query_budget(3)
 async def get_task(
     task_id: UUID,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific task by ID."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
+    data_version = await get_data_version(db, current_user.id)
+    not_modified = check_etag(current_user.id, data_version, request, response)
+    if not_modified:
+        return not_modified
+    
+    result = await db.execute(
+        select(Task).options(joinedload(Task.category)).where(Task.id == task_id)
+    )
     task = result.scalar_one_or_none()
     
     if not task:
@@ -125,50 +849,94 @@ async def get_task(
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
+@query_budget(6)
 async def update_task(
     task_id: UUID,
     task_data: TaskUpdate,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Update a task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
+    """Update a task.
     
-    if not task:
-        raise NotFoundException("Task not found")
+    Ownership is checked by the UPDATE itself; the row is only probed again
+    on a miss, to tell 404 from 403. Changes to counted fields (status,
+    priority, category) first lock the row to read the values being replaced.
+    """
+    owned = (Task.id == task_id, Task.user_id == current_user.id)
+    update_data = task_data.model_dump(exclude_unset=True)
     
-    if task.user_id != current_user.id:
-        raise ForbiddenException("You don't have permission to update this task")
+    if not update_data:
+        result = await db.execute(select(Task).options(selectinload(Task.category)).where(*owned))
+        task = result.scalar_one_or_none()
+        if task is None:
+            await _raise_task_miss(db, task_id, "update")
+        return task
+    
+    deltas = Counter()
+    if TASK_STAT_FIELDS & update_data.keys():
+        result = await db.execute(
+            select(Task.status, Task.priority, Task.category_id).where(*owned).with_for_update()
+        )
+        old = result.one_or_none()
+        if old is None:
+            await _raise_task_miss(db, task_id, "update")
+        remove_task(deltas, old.status, old.priority, old.category_id)
     
     # Update only provided fields
-    update_data = task_data.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(task, field, value)
+    result = await db.execute(
+        update(Task)
+        .where(*owned)
+        .values(**update_data, updated_at=datetime.utcnow())
+        .returning(Task)
+        .options(selectinload(Task.category))
+        .execution_options(synchronize_session=False)
+    )
+    task = result.scalar_one_or_none()
+    if task is None:
+        await _raise_task_miss(db, task_id, "update")
     
+    if deltas:
+        add_task(deltas, task.status, task.priority, task.category_id)
+        await apply_task_stat_deltas(db, current_user.id, deltas)
+    await bump_data_version(db, current_user.id)
     await db.commit()
-    await db.refresh(task, ["category"])
+    invalidate_user_counts(current_user.id)
     
     return task
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+@query_budget(6)
 async def delete_task(
     task_id: UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a task."""
-    result = await db.execute(select(Task).where(Task.id == task_id))
-    task = result.scalar_one_or_none()
-    
-    if not task:
-        raise NotFoundException("Task not found")
-    
-    if task.user_id != current_user.id:
-        raise ForbiddenException("You don't have permission to delete this task")
+    """Delete a task with a single ownership-checked DELETE ... RETURNING."""
+    result = await db.execute(
+        delete(Task)
+        .where(Task.id == task_id, Task.user_id == current_user.id)
+        .returning(Task.status, Task.priority, Task.category_id)
+        .execution_options(synchronize_session=False)
+    )
+    old = result.one_or_none()
+    if old is None:
+        await _raise_task_miss(db, task_id, "delete")
     
-    await db.delete(task)
+    deltas = Counter()
+    remove_task(deltas, old.status, old.priority, old.category_id)
+    await apply_task_stat_deltas(db, current_user.id, deltas)
+    await record_tombstones(db, current_user.id, "task", [task_id])
+    await bump_data_version(db, current_user.id)
     await db.commit()
+    invalidate_user_counts(current_user.id)
     
     return None
+
+
+async def _raise_task_miss(db: AsyncSession, task_id: UUID, action: str) -> None:
+    """Raise 404 or 403 after an ownership-checked statement matched no row."""
+    result = await db.execute(select(Task.id).where(Task.id == task_id))
+    if result.scalar_one_or_none() is None:
+        raise NotFoundException("Task not found")
+    raise ForbiddenException(f"You don't have permission to {action} this task")
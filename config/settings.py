@@ -7,12 +7,33 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    # "pgbouncer-transaction" disables asyncpg's prepared statement cache so
+    # statements survive server connection switches; "direct" enables it
+    DATABASE_CONNECTION_MODE: str = "pgbouncer-transaction"
+    DATABASE_STATEMENT_CACHE_SIZE: int = 100
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30
+    DATABASE_POOL_RECYCLE: int = -1
+    # What workers do with the schema at startup: "check" that it is
+    # migrated to head (one query), "create" missing tables (development)
+    # or "skip"
+    DATABASE_STARTUP_MODE: str = "check"
+    # Comma-separated read replica URLs for GET requests; empty disables
+    DATABASE_REPLICA_URLS: str = ""
+    # Reads stay on the primary this long after a user's write (replica lag)
+    REPLICA_STICKY_SECONDS: int = 5
+    REPLICA_HEALTH_CHECK_SECONDS: int = 10
+    REPLICA_RETRY_SECONDS: int = 30
     
     # JWT
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str = "HS256"
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    JWT_BACKEND: str = "jose"  # see core.jwt_backend.JWT_BACKENDS
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    REVOCATION_SYNC_SECONDS: int = 5
     
     # API
     API_V1_PREFIX: str = "/api/v1"
@@ -24,13 +45,59 @@ class Settings(BaseSettings):
     ALLOWED_ORIGINS: str = "http://localhost:3000"
     
     # Rate Limiting
-    RATE_LIMIT_PER_MINUTE: int = 60
+    RATE_LIMIT_PER_MINUTE: int = 60  # per user (or IP) across all API routes
+    RATE_LIMIT_BURST: int = 0  # bucket size; 0 means RATE_LIMIT_PER_MINUTE
+    RATE_LIMIT_MAX_CLIENTS: int = 100000
     LOGIN_RATE_LIMIT: int = 5
+    # memory:// counts per process; use sqlite:////path/ratelimit.db to share
+    # limits between workers on a host, or redis://host:6379 across hosts
+    RATE_LIMIT_STORAGE_URI: str = "memory://"
+    RATE_LIMIT_STRATEGY: str = "sliding-window-counter"
+    
+    # Password hashing
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    # Cost of new hashes; stored hashes at a lower cost are redone on login.
+    # Set BCRYPT_TARGET_MS to instead pick the cost by timing it at startup
+    # (each worker calibrates separately, so costs may differ between hosts).
+    BCRYPT_ROUNDS: int = 12
+    BCRYPT_TARGET_MS: int = 0
+    BCRYPT_MIN_ROUNDS: int = 10
+    BCRYPT_MAX_ROUNDS: int = 16
+    
+    # Authenticated-user cache (per process; other workers see changes
+    # to a user after at most the TTL)
+    USER_CACHE_TTL_SECONDS: int = 10
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Pagination
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    COUNT_CACHE_MAX_USERS: int = 10000
+    COUNT_ESTIMATE_LIMIT: int = 1000
+    
+    # Delta sync
+    TOMBSTONE_RETENTION_DAYS: int = 30
+    SYNC_OVERLAP_SECONDS: int = 5
+    
+    # Per-request SQL budgets (see utils.query_budget): "off", "warn" or "raise"
+    QUERY_BUDGET_MODE: str = "off"
+    QUERY_BUDGET_DEFAULT: int = 10
+    QUERY_REPEAT_THRESHOLD: int = 3
+    
+    # Export / import
+    EXPORT_BATCH_SIZE: int = 500
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_RECORD_LENGTH: int = 65536
     
     @property
     def origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
     
+    @property
+    def replica_urls_list(self) -> List[str]:
+        return [url.strip() for url in self.DATABASE_REPLICA_URLS.split(",") if url.strip()]
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
@@ -37,3 +37,28 @@ class ConflictException(TaskFlowException):
             status_code=status.HTTP_409_CONFLICT,
             detail=detail
         )
+
+
+class BadRequestException(TaskFlowException):
+    def __init__(self, detail: str = "Invalid request"):
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=detail
+        )
+
+
+class GoneException(TaskFlowException):
+    def __init__(self, detail: str = "Resource is no longer available"):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail=detail
+        )
+
+
+class ServiceUnavailableException(TaskFlowException):
+    def __init__(self, detail: str = "Service temporarily unavailable", retry_after: int = 1):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Type
+
+
+class TokenError(Exception):
+    """Raised by a backend when a token is malformed, forged or expired."""
+    pass
+
+
+class JWTBackend(ABC):
+    """Interface for the library that signs and verifies JWTs."""
+    
+    name = ""
+    
+    @abstractmethod
+    def encode(self, payload: Dict, key: str, algorithm: str) -> str:
+        """Sign ``payload`` and return the compact token."""
+    
+    @abstractmethod
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict:
+        """Verify ``token`` and return its claims, raising TokenError if invalid."""
+
+
+class JoseBackend(JWTBackend):
+    """python-jose, the default."""
+    
+    name = "jose"
+    
+    def __init__(self):
+        from jose import JWTError, jwt
+        self._jwt = jwt
+        self._error = JWTError
+    
+    def encode(self, payload: Dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm)
+    
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as exc:
+            raise TokenError(str(exc)) from exc
+
+
+class PyJWTBackend(JWTBackend):
+    """PyJWT; install ``PyJWT`` to use it."""
+    
+    name = "pyjwt"
+    
+    def __init__(self):
+        import jwt
+        self._jwt = jwt
+        self._error = jwt.PyJWTError
+    
+    def encode(self, payload: Dict, key: str, algorithm: str) -> str:
+        return self._jwt.encode(payload, key, algorithm=algorithm)
+    
+    def decode(self, token: str, key: str, algorithms: List[str]) -> Dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=algorithms)
+        except self._error as exc:
+            raise TokenError(str(exc)) from exc
+
+
+JWT_BACKENDS: Dict[str, Type[JWTBackend]] = {
+    backend.name: backend for backend in (JoseBackend, PyJWTBackend)
+}
+
+
+def get_jwt_backend(name: str) -> JWTBackend:
+    """Instantiate the backend registered under ``name``."""
+    try:
+        backend = JWT_BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JWT backend {name!r}; choose from {sorted(JWT_BACKENDS)}")
+    
+    try:
+        return backend()
+    except ImportError as exc:
+        raise ValueError(f"JWT backend {name!r} is not installed: {exc}") from exc
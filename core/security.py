@@ -1,13 +1,38 @@
+import asyncio
 import bcrypt
-from jose import JWTError, jwt
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from config.settings import settings
-from typing import Optional, Dict
-from uuid import UUID
+from core.exceptions import ServiceUnavailableException
+from core.jwt_backend import TokenError, get_jwt_backend
+from utils.cache import TTLCache
+from typing import Callable, Optional, Dict, TypeVar
+from uuid import UUID, uuid4
 
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt."""
+T = TypeVar("T")
+
+# bcrypt releases the GIL, so a small thread pool hashes in parallel without
+# blocking the event loop. Its size is the concurrency cap for hashing.
+_password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_jobs = 0
+
+# Cost factor for new hashes; see calibrate_bcrypt_rounds
+_bcrypt_rounds = settings.BCRYPT_ROUNDS
+
+jwt_backend = get_jwt_backend(settings.JWT_BACKEND)
+
+# sha256(token) -> verified claims; each entry expires with its token
+_token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_MAX_ENTRIES, ttl=0)
+
+
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
+    """Hash a password using bcrypt at the configured (or given) cost."""
     # Convert password to bytes
     password_bytes = password.encode('utf-8')
     
@@ -16,7 +41,7 @@ def hash_password(password: str) -> str:
         password_bytes = password_bytes[:72]
     
     # Generate salt and hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds or _bcrypt_rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     
     # Return as string
@@ -38,6 +63,98 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def get_bcrypt_rounds() -> int:
+    """Cost factor used for new password hashes."""
+    return _bcrypt_rounds
+
+
+def set_bcrypt_rounds(rounds: int) -> None:
+    global _bcrypt_rounds
+    _bcrypt_rounds = rounds
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Whether a stored hash was made at a lower cost than the current one.
+    
+    Hashes at a higher cost are kept, so workers that calibrate to slightly
+    different costs don't keep redoing each other's hashes.
+    """
+    try:
+        return int(hashed_password.split("$")[2]) < _bcrypt_rounds
+    except (IndexError, ValueError):
+        return True
+
+
+def time_bcrypt(rounds: int, samples: int = 1) -> float:
+    """Average seconds taken to hash a password at ``rounds``."""
+    start = time.perf_counter()
+    for _ in range(samples):
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+    return (time.perf_counter() - start) / samples
+
+
+def calibrate_bcrypt_rounds(target_ms: float) -> int:
+    """Highest cost whose hash time stays within ``target_ms`` on this machine.
+    
+    Each extra round doubles the work, so the search stops at the first
+    cost over budget. Never goes below BCRYPT_MIN_ROUNDS.
+    """
+    rounds = settings.BCRYPT_MIN_ROUNDS
+    while rounds < settings.BCRYPT_MAX_ROUNDS and time_bcrypt(rounds + 1) * 1000 <= target_ms:
+        rounds += 1
+    return rounds
+
+
+async def configure_bcrypt_rounds() -> int:
+    """Apply BCRYPT_TARGET_MS at startup, if set, and return the cost in use."""
+    if settings.BCRYPT_TARGET_MS:
+        loop = asyncio.get_running_loop()
+        rounds = await loop.run_in_executor(
+            _password_executor, calibrate_bcrypt_rounds, settings.BCRYPT_TARGET_MS
+        )
+        set_bcrypt_rounds(rounds)
+    return _bcrypt_rounds
+
+
+async def _run_password_job(func: Callable[..., T], *args) -> T:
+    """Run a bcrypt call on the hashing pool, shedding load once it is full.
+    
+    At most PASSWORD_HASH_WORKERS jobs run at once and PASSWORD_HASH_QUEUE_LIMIT
+    more may wait; anything beyond that is rejected immediately with a 503
+    instead of queueing behind a login storm.
+    """
+    global _password_jobs
+    
+    capacity = settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT
+    if _password_jobs >= capacity:
+        raise ServiceUnavailableException(
+            "Too many authentication requests, please retry shortly",
+            retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS
+        )
+    
+    _password_jobs += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_password_executor, func, *args)
+    finally:
+        _password_jobs -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the hashing pool without blocking the event loop."""
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing pool without blocking the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+def shutdown_password_executor() -> None:
+    """Stop the hashing pool's worker threads."""
+    _password_executor.shutdown(wait=False, cancel_futures=True)
+
+
 def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
@@ -49,10 +166,11 @@ def create_access_token(data: Dict, expires_delta: Optional[timedelta] = None) -
     
     to_encode.update({
         "exp": expire,
-        "type": "access"
+        "type": "access",
+        "jti": uuid4().hex
     })
     
-    encoded_jwt = jwt.encode(
+    encoded_jwt = jwt_backend.encode(
         to_encode,
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
@@ -67,10 +185,11 @@ def create_refresh_token(data: Dict) -> str:
     
     to_encode.update({
         "exp": expire,
-        "type": "refresh"
+        "type": "refresh",
+        "jti": uuid4().hex
     })
     
-    encoded_jwt = jwt.encode(
+    encoded_jwt = jwt_backend.encode(
         to_encode,
         settings.JWT_SECRET_KEY,
         algorithm=settings.JWT_ALGORITHM
@@ -79,13 +198,34 @@ def create_refresh_token(data: Dict) -> str:
 
 
 def decode_token(token: str) -> Dict:
-    """Decode and verify JWT token."""
+    """Decode and verify JWT token.
+    
+    Verified claims are cached by token digest until the token's ``exp``, so
+    a token presented again skips parsing and signature verification.
+    """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = _token_cache.get(digest)
+    if cached is not None:
+        return dict(cached)
+    
     try:
-        payload = jwt.decode(
+        payload = jwt_backend.decode(
             token,
             settings.JWT_SECRET_KEY,
             algorithms=[settings.JWT_ALGORITHM]
         )
-        return payload
-    except JWTError:
+    except TokenError:
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        ttl = exp - time.time()
+        if ttl > 0:
+            _token_cache.set(digest, dict(payload), ttl=ttl)
+    
+    return payload
+
+
+def token_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and current size of the verified-token cache."""
+    return {"hits": _token_cache.hits, "misses": _token_cache.misses, "size": len(_token_cache)}
@@ -0,0 +1,67 @@
+import logging
+from pathlib import Path
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from alembic.util import CommandError
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from database.base import Base
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def script_directory() -> ScriptDirectory:
+    """The Alembic migration scripts, independent of the working directory."""
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "migrations"))
+    return ScriptDirectory.from_config(config)
+
+
+async def check_schema_revision(engine: AsyncEngine) -> str:
+    """Make sure the database is migrated for this code, in a single query.
+    
+    Raises RuntimeError when the schema is missing or behind. A revision this
+    code does not know is assumed to come from a newer release mid-rollout
+    and is only logged.
+    """
+    script = script_directory()
+    head = script.get_current_head()
+    
+    # Connection and authentication errors propagate; only a missing
+    # alembic_version table means the schema is not versioned
+    async with engine.connect() as conn:
+        try:
+            current = (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar()
+        except DBAPIError:
+            await conn.rollback()
+            if await conn.run_sync(lambda sync_conn: inspect(sync_conn).has_table("alembic_version")):
+                raise
+            current = None
+    
+    if current == head:
+        return current
+    
+    if current is None:
+        raise RuntimeError(
+            "Database schema is not versioned. Run `alembic upgrade head`, or "
+            "`python manage.py create-tables` for a new database."
+        )
+    
+    try:
+        script.get_revision(current)
+    except CommandError:
+        logger.warning("Database is at revision %s, which is newer than this code's %s", current, head)
+        return current
+    
+    raise RuntimeError(f"Database is at revision {current} but this code needs {head}. Run `alembic upgrade head`.")
+
+
+def create_tables(connection: Connection) -> None:
+    """Create every table and mark the database as migrated to head."""
+    Base.metadata.create_all(connection)
+    MigrationContext.configure(connection).stamp(script_directory(), "head")
@@ -1,39 +1,266 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+import asyncio
+import hashlib
+import hmac
+import logging
+import math
+import time
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from config.settings import settings
-from typing import AsyncGenerator
-
-# Create async engine with connection pooling and disabled statement cache
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    echo=settings.DEBUG,
-    future=True,
-    pool_size=5,
-    max_overflow=10,
-    pool_pre_ping=True,
-    connect_args={
-        "statement_cache_size": 0,  # Disable prepared statement cache
-        "prepared_statement_cache_size": 0,  # Additional safety
+from typing import AsyncGenerator, Iterable, List, Optional
+from uuid import UUID
+from utils.cache import TTLCache
+from utils.metrics import TimedAsyncQueuePool, instrument_engine
+from utils.query_budget import install_query_budget
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_MODES = ("pgbouncer-transaction", "direct")
+
+
+def engine_options(url: str, mode: Optional[str] = None) -> dict:
+    """Keyword arguments for create_async_engine under a connection mode."""
+    mode = mode or settings.DATABASE_CONNECTION_MODE
+    if mode not in CONNECTION_MODES:
+        raise ValueError(f"DATABASE_CONNECTION_MODE must be one of {CONNECTION_MODES}, not {mode!r}")
+    
+    options = {
+        "echo": settings.DEBUG,
+        "future": True,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        "pool_pre_ping": True,
     }
+    if ":memory:" not in url:
+        options["poolclass"] = TimedAsyncQueuePool
+    
+    if "+asyncpg" in url:
+        cache_size = settings.DATABASE_STATEMENT_CACHE_SIZE if mode == "direct" else 0
+        options["connect_args"] = {
+            "statement_cache_size": cache_size,  # asyncpg's own cache
+            "prepared_statement_cache_size": cache_size,  # SQLAlchemy's asyncpg adapter cache
+        }
+    
+    return options
+
+
+# Create async engine with connection pooling
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument_engine(engine, "primary")
+if settings.QUERY_BUDGET_MODE != "off":
+    install_query_budget(engine)
+
+
+class ReplicaRouter:
+    """Round-robin over the read replicas that are currently healthy."""
+    
+    def __init__(self, engines: Iterable[AsyncEngine]):
+        self.engines: List[AsyncEngine] = list(engines)
+        self._down_until = [0.0] * len(self.engines)
+        self._next = 0
+        
+        for index, replica in enumerate(self.engines):
+            event.listen(replica.sync_engine, "handle_error", self._on_error)
+            instrument_engine(replica, f"replica-{index}")
+            if settings.QUERY_BUDGET_MODE != "off":
+                install_query_budget(replica)
+    
+    def choose(self) -> Optional[AsyncEngine]:
+        """Next healthy replica, or None when there is none."""
+        now = time.monotonic()
+        for _ in range(len(self.engines)):
+            index = self._next % len(self.engines)
+            self._next += 1
+            if self._down_until[index] <= now:
+                return self.engines[index]
+        return None
+    
+    def mark_down(self, replica: AsyncEngine) -> None:
+        """Stop routing to ``replica`` until it passes a health check."""
+        index = self.engines.index(replica)
+        self._down_until[index] = time.monotonic() + settings.REPLICA_RETRY_SECONDS
+    
+    def mark_up(self, replica: AsyncEngine) -> None:
+        self._down_until[self.engines.index(replica)] = 0.0
+    
+    def _on_error(self, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            for replica in self.engines:
+                if replica.sync_engine is context.engine:
+                    logger.warning("Read replica %s is unreachable", replica.url.render_as_string())
+                    self.mark_down(replica)
+    
+    async def check_health(self) -> None:
+        for replica in self.engines:
+            try:
+                async with replica.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+                self.mark_up(replica)
+            except Exception:
+                logger.warning("Read replica %s failed its health check", replica.url.render_as_string())
+                self.mark_down(replica)
+    
+    async def run_health_checks(self) -> None:
+        """Re-check every replica every REPLICA_HEALTH_CHECK_SECONDS."""
+        while True:
+            await asyncio.sleep(settings.REPLICA_HEALTH_CHECK_SECONDS)
+            await self.check_health()
+    
+    async def dispose(self) -> None:
+        for replica in self.engines:
+            await replica.dispose()
+
+
+replicas = ReplicaRouter(
+    create_async_engine(url, **engine_options(url)) for url in settings.replica_urls_list
 )
 
+# user_id -> True while this worker routes the user's reads to the primary
+_recent_writers = TTLCache(maxsize=100000, ttl=settings.REPLICA_STICKY_SECONDS)
+
+# Cookie carrying "<unix time>.<signature>" until which a client reads from the primary
+PRIMARY_COOKIE = "primary_until"
+
+
+def stick_to_primary(user_id: UUID) -> None:
+    """Route the user's reads to the primary on this worker for a while.
+    
+    Other workers only know about the write through the client's
+    PRIMARY_COOKIE (see PrimaryStickinessMiddleware).
+    """
+    if replicas.engines:
+        _recent_writers.set(user_id, True)
+
+
+def _sign(value: str) -> str:
+    digest = hmac.new(settings.JWT_SECRET_KEY.encode(), value.encode(), hashlib.sha256)
+    return digest.hexdigest()[:32]
+
+
+def primary_cookie(until: float) -> str:
+    """Signed PRIMARY_COOKIE value for reads on the primary until ``until``."""
+    value = str(math.ceil(until))
+    return f"{value}.{_sign(value)}"
+
+
+def primary_cookie_until(cookie: Optional[str]) -> float:
+    """The time carried by a valid PRIMARY_COOKIE value, else 0."""
+    value, _, signature = (cookie or "").partition(".")
+    if not value.isdigit() or not hmac.compare_digest(signature, _sign(value)):
+        return 0.0
+    return float(value)
+
+
+class PrimaryStickinessMiddleware:
+    """Tell clients that just wrote to keep reading from the primary.
+    
+    Successful unsafe requests set PRIMARY_COOKIE for REPLICA_STICKY_SECONDS,
+    and get_db honours it on any worker. Clients that don't keep cookies
+    only get the per-worker stickiness of stick_to_primary, so they may
+    still read a lagging replica right after a write.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_ONLY_METHODS or not replicas.engines:
+            await self.app(scope, receive, send)
+            return
+        
+        async def send_with_cookie(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = settings.REPLICA_STICKY_SECONDS
+                cookie = (
+                    f"{PRIMARY_COOKIE}={primary_cookie(time.time() + seconds)}; "
+                    f"Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"set-cookie", cookie.encode())]
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cookie)
+
+
+class RoutingSession(Session):
+    """Session that sends read-only requests to a replica.
+    
+    A session is read-only when get_db marks it so for a safe method. Its
+    engine is chosen on the first statement and kept for the session, after
+    get_current_user has recorded whose request it is. Clients with a valid
+    PRIMARY_COOKIE, and users who wrote through this worker within
+    REPLICA_STICKY_SECONDS, keep reading from the primary.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, **kw):
+        bind = self.info.get("bind")
+        if bind is None:
+            bind = engine
+            user_id = self.info.get("user_id")
+            if (
+                self.info.get("read_only")
+                and not self.info.get("primary")
+                and (user_id is None or _recent_writers.get(user_id) is None)
+            ):
+                bind = replicas.choose() or engine
+            self.info["bind"] = bind
+        return bind.sync_engine
+
+
 # Create async session factory
 AsyncSessionLocal = async_sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=RoutingSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
 )
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency to get database session."""
+# Requests with these methods never write, so their sessions are not committed
+READ_ONLY_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dependency to get database session.
+    
+    The session checks a connection out of the pool on its first query, so
+    requests rejected before touching the database (bad token, invalid
+    body) never hold one. Sessions for read-only methods are not
+    committed: closing them returns the connection, and the pool's reset
+    on return ends the transaction. They are also routed to a read replica
+    when DATABASE_REPLICA_URLS is set (see RoutingSession).
+    """
+    if request.method in READ_ONLY_METHODS:
+        async with AsyncSessionLocal() as session:
+            session.info["read_only"] = True
+            if primary_cookie_until(request.cookies.get(PRIMARY_COOKIE)) > time.time():
+                session.info["primary"] = True
+            yield session
+        return
+    
     async with AsyncSessionLocal() as session:
         try:
             yield session
             await session.commit()
+            if session.info.get("user_id") is not None:
+                stick_to_primary(session.info["user_id"])
         except Exception:
             await session.rollback()
             raise
         finally:
             await session.close()
+
+
+def get_session_factory() -> async_sessionmaker:
+    """Dependency returning the session factory.
+    
+    For work that outlives the request-scoped session, such as streamed
+    responses that keep reading after the endpoint has returned.
+    """
+    return AsyncSessionLocal
@@ -118,6 +118,15 @@ async function handleLogin(e) {
 }
 
 function logout() {
+    if (accessToken) {
+        // Revoke the token server-side; the local session ends either way
+        fetch(`${API_BASE_URL}/auth/logout`, {
+            method: 'POST',
+            headers: {
+                'Authorization': `Bearer ${accessToken}`
+            }
+        }).catch(() => {});
+    }
     accessToken = null;
     currentUser = null;
     categories = [];
@@ -340,7 +349,7 @@ async function loadTasks() {
     const categoryId = document.getElementById('filter-category').value;
     const search = document.getElementById('search-input').value;
 
-    let url = `${API_BASE_URL}/tasks?`;
+    let url = `${API_BASE_URL}/tasks?page=1&`;
     if (status) url += `status=${status}&`;
     if (priority) url += `priority=${priority}&`;
     if (categoryId) url += `category_id=${categoryId}&`;
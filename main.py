@@ -1,3 +1,7 @@
+import time
+
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
@@ -5,9 +9,15 @@ from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 from api.v1.router import api_router
 from config.settings import settings
-from database.base import Base
-from database.session import engine
+from database.schema import check_schema_revision, create_tables
+from database.session import engine, replicas, AsyncSessionLocal, PrimaryStickinessMiddleware
+from core.security import configure_bcrypt_rounds, shutdown_password_executor
 from utils.rate_limiter import limiter
+from utils.token_bucket import RateLimitMiddleware
+from utils.metrics import MetricsMiddleware, TimedRoute, metrics_response
+from utils.query_budget import QueryBudgetMiddleware
+from utils.revocation import run_revocation_sync, sync_revocations
+import asyncio
 import logging
 from datetime import datetime
 import os
@@ -24,12 +34,19 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
 )
+app.router.route_class = TimedRoute
 
 # Add rate limiter to app state
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 
+# Clients that just wrote keep reading from the primary, on any worker
+app.add_middleware(PrimaryStickinessMiddleware)
+
+# Per-user token buckets for every API route (inside CORS, so 429s carry CORS headers)
+app.add_middleware(RateLimitMiddleware)
+
 ALLOWED_ORIGINS = os.getenv("ALLOWED_ORIGINS", "http://localhost:8000").split(",")
 
 # Add CORS middleware
@@ -41,25 +58,73 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Debug/test/staging only: per-request SQL budgets and N+1 detection
+if settings.QUERY_BUDGET_MODE != "off":
+    app.add_middleware(QueryBudgetMiddleware)
+
+# Outermost, so latency and Server-Timing cover every other layer
+app.add_middleware(MetricsMiddleware)
+
 # Include API routers
 app.include_router(api_router, prefix=settings.API_V1_PREFIX)
 
 
+_import_seconds = time.perf_counter() - _import_started
+
+
 @app.on_event("startup")
 async def startup():
     """Initialize database on startup."""
     logger.info("Starting up TaskFlow API...")
-    async with engine.begin() as conn:
-        # Create all tables
-        await conn.run_sync(Base.metadata.create_all)
-    logger.info("Database tables created successfully")
+    timings = {"import": _import_seconds}
+    
+    started = time.perf_counter()
+    if settings.DATABASE_STARTUP_MODE == "check":
+        revision = await check_schema_revision(engine)
+        logger.info("Database schema is at revision %s", revision)
+    elif settings.DATABASE_STARTUP_MODE == "create":
+        async with engine.begin() as conn:
+            await conn.run_sync(create_tables)
+        logger.info("Database tables created successfully")
+    timings["schema"] = time.perf_counter() - started
+    
+    started = time.perf_counter()
+    logger.info("Hashing new passwords with bcrypt cost %d", await configure_bcrypt_rounds())
+    timings["bcrypt"] = time.perf_counter() - started
+    
+    # Load revoked tokens, then keep picking up revocations from other workers
+    started = time.perf_counter()
+    async with AsyncSessionLocal() as session:
+        await sync_revocations(session)
+    app.state.revocation_sync = asyncio.create_task(run_revocation_sync(AsyncSessionLocal))
+    timings["revocations"] = time.perf_counter() - started
+    
+    if replicas.engines:
+        started = time.perf_counter()
+        await replicas.check_health()
+        app.state.replica_health = asyncio.create_task(replicas.run_health_checks())
+        logger.info("Routing reads to %d replica(s)", len(replicas.engines))
+        timings["replicas"] = time.perf_counter() - started
+    
+    app.state.startup_timings = timings
+    logger.info(
+        "Startup completed in %.0f ms (%s)",
+        sum(timings.values()) * 1000,
+        ", ".join(f"{step} {seconds * 1000:.0f} ms" for step, seconds in timings.items())
+    )
 
 
 @app.on_event("shutdown")
 async def shutdown():
     """Cleanup on shutdown."""
     logger.info("Shutting down TaskFlow API...")
+    for name in ("revocation_sync", "replica_health"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
     await engine.dispose()
+    await replicas.dispose()
+    shutdown_password_executor()
 
 
 @app.get("/", tags=["Root"])
@@ -83,6 +148,12 @@ async def health_check():
     }
 
 
+@app.get("/metrics", tags=["Health"], include_in_schema=False)
+async def metrics():
+    """Prometheus metrics."""
+    return metrics_response()
+
+
 # Serve frontend files
 @app.get("/app", tags=["Frontend"])
 async def serve_app():
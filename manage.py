@@ -0,0 +1,175 @@
+"""Administrative commands for TaskFlow API.
+
+Usage:
+    python manage.py create-tables
+    python manage.py check-schema
+    python manage.py rebuild-stats [--user-id UUID]
+    python manage.py bench-jwt [--backend NAME ...] [--iterations N]
+    python manage.py bench-bcrypt [--min-rounds N] [--max-rounds N] [--samples N]
+    python manage.py bench-statement-cache [--user-id UUID] [--iterations N]
+"""
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+import uuid
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from database.schema import check_schema_revision, create_tables
+from database.session import AsyncSessionLocal, engine, engine_options
+from utils.task_stats import rebuild_task_stats
+from config.settings import settings
+from core.jwt_backend import JWT_BACKENDS, get_jwt_backend
+from core.security import get_bcrypt_rounds, time_bcrypt
+import models.user  # noqa: F401  (register mappers and tables)
+import models.category  # noqa: F401
+import models.task  # noqa: F401
+import models.tombstone  # noqa: F401
+import models.task_stat  # noqa: F401
+import models.revoked_token  # noqa: F401
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def create_all_tables():
+    """Create the schema in a new database and stamp it at the latest migration."""
+    async with engine.begin() as conn:
+        await conn.run_sync(create_tables)
+    await engine.dispose()
+    logger.info("Database tables created")
+
+
+async def check_schema():
+    """Report whether the database is migrated to this code's revision."""
+    try:
+        revision = await check_schema_revision(engine)
+    finally:
+        await engine.dispose()
+    logger.info("Database schema is at revision %s", revision)
+
+
+async def rebuild_stats(user_id: UUID = None):
+    """Recompute per-user task counters from the tasks table."""
+    async with AsyncSessionLocal() as session:
+        await rebuild_task_stats(session, user_id)
+        await session.commit()
+    await engine.dispose()
+    logger.info("Task statistics rebuilt for %s", user_id or "all users")
+
+
+def bench_jwt(backends, iterations: int):
+    """Report encode/decode throughput of each JWT backend for an access token."""
+    payload = {"sub": str(uuid.uuid4()), "type": "access", "exp": int(time.time()) + 900}
+    
+    for name in backends:
+        try:
+            backend = get_jwt_backend(name)
+        except ValueError as exc:
+            print(f"{name:>8}: skipped ({exc})")
+            continue
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            token = backend.encode(payload, settings.JWT_SECRET_KEY, settings.JWT_ALGORITHM)
+        encode_rate = iterations / (time.perf_counter() - start)
+        
+        start = time.perf_counter()
+        for _ in range(iterations):
+            backend.decode(token, settings.JWT_SECRET_KEY, [settings.JWT_ALGORITHM])
+        decode_rate = iterations / (time.perf_counter() - start)
+        
+        print(f"{name:>8}: encode {encode_rate:10,.0f} tokens/s   decode {decode_rate:10,.0f} tokens/s")
+
+
+def bench_bcrypt(min_rounds: int, max_rounds: int, samples: int):
+    """Report bcrypt hash latency at each cost factor."""
+    current = get_bcrypt_rounds()
+    for rounds in range(min_rounds, max_rounds + 1):
+        elapsed_ms = time_bcrypt(rounds, samples) * 1000
+        marker = "  <- BCRYPT_ROUNDS" if rounds == current else ""
+        print(f"cost {rounds:2d}: {elapsed_ms:9.1f} ms/hash  {1000 / elapsed_ms:8.1f} hashes/s per core{marker}")
+
+
+async def bench_statement_cache(user_id: UUID, iterations: int):
+    """Compare list_tasks page latency with asyncpg's statement cache off and on."""
+    from api.v1.endpoints.tasks import _list_tasks_keyset
+    from models.task import Task
+    
+    if "+asyncpg" not in settings.DATABASE_URL:
+        print("The statement cache only applies to postgresql+asyncpg URLs")
+        return
+    
+    if user_id is None:
+        async with AsyncSessionLocal() as session:
+            user_id = await session.scalar(select(Task.user_id).limit(1))
+        if user_id is None:
+            print("No tasks to list; create some first or pass --user-id")
+            return
+    
+    for mode in ("pgbouncer-transaction", "direct"):
+        bench_engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, mode))
+        sessions = async_sessionmaker(bench_engine, expire_on_commit=False)
+        timings = []
+        async with sessions() as session:
+            for i in range(iterations + 10):
+                query = select(Task).where(Task.user_id == user_id)
+                start = time.perf_counter()
+                await _list_tasks_keyset(session, query, None, 20, "created_at", Task.created_at, "desc")
+                if i >= 10:  # warm-up
+                    timings.append((time.perf_counter() - start) * 1000)
+                session.expunge_all()
+        await bench_engine.dispose()
+        
+        timings.sort()
+        print(
+            f"{mode:>22}: mean {statistics.mean(timings):6.2f} ms   "
+            f"p50 {timings[len(timings) // 2]:6.2f} ms   p99 {timings[int(len(timings) * 0.99)]:6.2f} ms"
+        )
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="TaskFlow API management commands")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    commands.add_parser("create-tables", help="Create all tables in a new database and stamp it at head")
+    commands.add_parser("check-schema", help="Check the database is migrated to the latest revision")
+    
+    rebuild = commands.add_parser("rebuild-stats", help="Repair drift in per-user task counters")
+    rebuild.add_argument("--user-id", type=UUID, default=None, help="Only rebuild this user's counters")
+    
+    bench = commands.add_parser("bench-jwt", help="Measure JWT encode/decode throughput per backend")
+    bench.add_argument("--backend", action="append", choices=sorted(JWT_BACKENDS), help="Backend to measure (default: all)")
+    bench.add_argument("--iterations", type=int, default=10000)
+    
+    bcrypt_bench = commands.add_parser("bench-bcrypt", help="Measure bcrypt hash latency per cost factor")
+    bcrypt_bench.add_argument("--min-rounds", type=int, default=settings.BCRYPT_MIN_ROUNDS)
+    bcrypt_bench.add_argument("--max-rounds", type=int, default=14)
+    bcrypt_bench.add_argument("--samples", type=int, default=3)
+    
+    cache_bench = commands.add_parser(
+        "bench-statement-cache", help="Measure list_tasks latency with the asyncpg statement cache off and on"
+    )
+    cache_bench.add_argument("--user-id", type=UUID, default=None, help="User whose tasks to list")
+    cache_bench.add_argument("--iterations", type=int, default=1000)
+    
+    args = parser.parse_args()
+    if args.command == "create-tables":
+        asyncio.run(create_all_tables())
+    elif args.command == "check-schema":
+        asyncio.run(check_schema())
+    elif args.command == "rebuild-stats":
+        asyncio.run(rebuild_stats(args.user_id))
+    elif args.command == "bench-jwt":
+        bench_jwt(args.backend or sorted(JWT_BACKENDS), args.iterations)
+    elif args.command == "bench-bcrypt":
+        bench_bcrypt(args.min_rounds, args.max_rounds, args.samples)
+    elif args.command == "bench-statement-cache":
+        asyncio.run(bench_statement_cache(args.user_id, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Ordinal priority column and composite indexes for list_tasks
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PRIORITY_RANK_SQL = (
+    "CASE priority WHEN 'LOW' THEN 0 WHEN 'MEDIUM' THEN 1 "
+    "WHEN 'HIGH' THEN 2 WHEN 'URGENT' THEN 3 END"
+)
+
+INDEXES = [
+    ("ix_tasks_user_created", ["user_id", "created_at", "id"]),
+    ("ix_tasks_user_due", ["user_id", "due_date", "id"]),
+    ("ix_tasks_user_priority", ["user_id", "priority_rank", "id"]),
+    ("ix_tasks_user_status_created", ["user_id", "status", "created_at", "id"]),
+    ("ix_tasks_user_status_due", ["user_id", "status", "due_date", "id"]),
+    ("ix_tasks_user_status_priority", ["user_id", "status", "priority_rank", "id"]),
+    ("ix_tasks_user_category_created", ["user_id", "category_id", "created_at", "id"]),
+]
+
+# Superseded by the composite indexes above, all of which lead with user_id
+DROPPED_INDEXES = [
+    ("ix_tasks_user_id", ["user_id"]),
+    ("ix_tasks_status", ["status"]),
+]
+
+
+def upgrade() -> None:
+    # SQLite can only add virtual generated columns with ALTER TABLE
+    storage = "STORED" if op.get_bind().dialect.name == "postgresql" else "VIRTUAL"
+    op.execute(
+        f"ALTER TABLE tasks ADD COLUMN priority_rank SMALLINT "
+        f"GENERATED ALWAYS AS ({PRIORITY_RANK_SQL}) {storage} NOT NULL"
+    )
+    
+    # Build indexes without blocking writes on Postgres
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "tasks", columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, _ in DROPPED_INDEXES:
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in DROPPED_INDEXES:
+            op.create_index(name, "tasks", columns, postgresql_concurrently=True, if_not_exists=True)
+        for name, _ in INDEXES:
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True, if_exists=True)
+    
+    op.drop_column("tasks", "priority_rank")
@@ -0,0 +1,44 @@
+"""Tombstones and updated_at index for delta sync
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.UUID(as_uuid=True), primary_key=True),
+        sa.Column("user_id", sa.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("entity_type", sa.String(20), nullable=False),
+        sa.Column("entity_id", sa.UUID(as_uuid=True), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_tombstones_user_deleted", "tombstones", ["user_id", "deleted_at"])
+    
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_user_updated",
+            "tasks",
+            ["user_id", "updated_at", "id"],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_tasks_user_updated", table_name="tasks", postgresql_concurrently=True, if_exists=True)
+    
+    op.drop_table("tombstones")
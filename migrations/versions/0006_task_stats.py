@@ -0,0 +1,48 @@
+"""Per-user task counters
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_stats",
+        sa.Column("user_id", sa.UUID(as_uuid=True), sa.ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("dimension", sa.String(20), primary_key=True),
+        sa.Column("key", sa.String(64), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    
+    if op.get_bind().dialect.name != "postgresql":
+        # Key formats differ on other backends; seed with
+        # `python manage.py rebuild-stats` instead
+        return
+    
+    # Seed counters for existing tasks
+    for dimension, column in [("status", "status"), ("priority", "priority")]:
+        op.execute(
+            f"INSERT INTO task_stats (user_id, dimension, key, count) "
+            f"SELECT user_id, '{dimension}', {column}::text, COUNT(*) "
+            f"FROM tasks GROUP BY user_id, {column}"
+        )
+    op.execute(
+        "INSERT INTO task_stats (user_id, dimension, key, count) "
+        "SELECT user_id, 'category', COALESCE(category_id::text, 'none'), COUNT(*) "
+        "FROM tasks GROUP BY user_id, category_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_stats")
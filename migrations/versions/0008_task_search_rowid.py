@@ -0,0 +1,85 @@
+"""Key the SQLite full-text index on an explicit column
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 00:00:00
+
+"""
+from typing import Sequence, Union
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _create_triggers(key: str, insert_body: str) -> None:
+    op.execute(f"""
+        CREATE TRIGGER tasks_fts_ai AFTER INSERT ON tasks BEGIN
+            {insert_body}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER tasks_fts_ad AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.{key}, old.title, old.description);
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+            VALUES ('delete', old.{key}, old.title, old.description);
+            INSERT INTO tasks_fts(rowid, title, description)
+            VALUES (new.{key}, new.title, new.description);
+        END
+    """)
+
+
+def _drop_index() -> None:
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS tasks_fts_ai")
+    op.execute("DROP TABLE IF EXISTS tasks_fts")
+
+
+def upgrade() -> None:
+    # The implicit rowid of a table without an INTEGER PRIMARY KEY may be
+    # renumbered by VACUUM, silently pointing the index at other tasks
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    
+    _drop_index()
+    op.execute("ALTER TABLE tasks ADD COLUMN search_rowid INTEGER")
+    op.execute("UPDATE tasks SET search_rowid = rowid")
+    op.execute("CREATE UNIQUE INDEX ix_tasks_search_rowid ON tasks (search_rowid)")
+    op.execute("""
+        CREATE VIRTUAL TABLE tasks_fts
+        USING fts5(title, description, content='tasks', content_rowid='search_rowid')
+    """)
+    _create_triggers("search_rowid", """
+            UPDATE tasks SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM tasks)
+            WHERE rowid = new.rowid;
+            INSERT INTO tasks_fts(rowid, title, description)
+            SELECT search_rowid, title, description FROM tasks WHERE rowid = new.rowid;
+    """)
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    
+    _drop_index()
+    op.execute("DROP INDEX IF EXISTS ix_tasks_search_rowid")
+    op.execute("ALTER TABLE tasks DROP COLUMN search_rowid")
+    op.execute("""
+        CREATE VIRTUAL TABLE tasks_fts
+        USING fts5(title, description, content='tasks', content_rowid='rowid')
+    """)
+    _create_triggers("rowid", """
+            INSERT INTO tasks_fts(rowid, title, description)
+            VALUES (new.rowid, new.title, new.description);
+    """)
+    op.execute("INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')")
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, String, UUID, ForeignKey, DateTime, Index
+from database.base import Base
+from datetime import datetime
+
+
+class RevokedToken(Base):
+    """A JWT revoked before its expiry, identified by its ``jti`` claim."""
+    __tablename__ = "revoked_tokens"
+    
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+    revoked_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, String, Text, UUID, ForeignKey, Enum, DateTime
+from sqlalchemy import (
+    Column, String, Text, UUID, ForeignKey, Enum, DateTime, SmallInteger, Computed, Index, DDL, event
+)
 from sqlalchemy.orm import relationship
 from database.base import Base, TimestampMixin
 import uuid
@@ -18,18 +20,105 @@ class TaskPriority(str, enum.Enum):
     URGENT = "URGENT"
 
 
+# Ordinal used for sorting and filtering by priority, lowest first
+PRIORITY_RANKS = {
+    TaskPriority.LOW: 0,
+    TaskPriority.MEDIUM: 1,
+    TaskPriority.HIGH: 2,
+    TaskPriority.URGENT: 3,
+}
+
+PRIORITY_RANK_SQL = "CASE priority " + " ".join(
+    f"WHEN '{priority.value}' THEN {rank}" for priority, rank in PRIORITY_RANKS.items()
+) + " END"
+
+
 class Task(Base, TimestampMixin):
     __tablename__ = "tasks"
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     category_id = Column(UUID(as_uuid=True), ForeignKey("categories.id", ondelete="SET NULL"), nullable=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)
-    status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False, index=True)
+    status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
+    priority_rank = Column(SmallInteger, Computed(PRIORITY_RANK_SQL, persisted=True), nullable=False)
     due_date = Column(DateTime, nullable=True, index=True)
     
     # Relationships
     user = relationship("User", back_populates="tasks")
     category = relationship("Category", back_populates="tasks")
+    
+    # Composite indexes matching the list_tasks filter/sort combinations.
+    # Every list query is scoped to one user, and id is the keyset tie-breaker.
+    __table_args__ = (
+        Index("ix_tasks_user_created", "user_id", "created_at", "id"),
+        Index("ix_tasks_user_due", "user_id", "due_date", "id"),
+        Index("ix_tasks_user_priority", "user_id", "priority_rank", "id"),
+        Index("ix_tasks_user_status_created", "user_id", "status", "created_at", "id"),
+        Index("ix_tasks_user_status_due", "user_id", "status", "due_date", "id"),
+        Index("ix_tasks_user_status_priority", "user_id", "status", "priority_rank", "id"),
+        Index("ix_tasks_user_category_created", "user_id", "category_id", "created_at", "id"),
+        # Delta sync scans changes since a cursor
+        Index("ix_tasks_user_updated", "user_id", "updated_at", "id"),
+    )
+
+
+# Full-text search: a generated tsvector column with a GIN index on Postgres,
+# and an external-content FTS5 table kept in sync by triggers on SQLite.
+POSTGRES_SEARCH_DDL = [
+    """
+    ALTER TABLE tasks ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_tasks_search_vector ON tasks USING GIN (search_vector)",
+]
+
+SQLITE_SEARCH_DDL = [
+    # tasks has a UUID primary key, so its implicit rowid may be renumbered by
+    # VACUUM; the FTS table is keyed on this explicit column instead
+    "ALTER TABLE tasks ADD COLUMN search_rowid INTEGER",
+    "CREATE UNIQUE INDEX IF NOT EXISTS ix_tasks_search_rowid ON tasks (search_rowid)",
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts
+    USING fts5(title, description, content='tasks', content_rowid='search_rowid')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        UPDATE tasks SET search_rowid = (SELECT coalesce(max(search_rowid), 0) + 1 FROM tasks)
+        WHERE rowid = new.rowid;
+        INSERT INTO tasks_fts(rowid, title, description)
+        SELECT search_rowid, title, description FROM tasks WHERE rowid = new.rowid;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.search_rowid, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF title, description ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, title, description)
+        VALUES ('delete', old.search_rowid, old.title, old.description);
+        INSERT INTO tasks_fts(rowid, title, description)
+        VALUES (new.search_rowid, new.title, new.description);
+    END
+    """,
+]
+
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    Task.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS tasks_fts").execute_if(dialect="sqlite")
+)
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Integer, UUID, ForeignKey
+from database.base import Base
+
+
+class TaskStat(Base):
+    """Per-user task counter, e.g. (user, "status", "TODO") -> 12.
+    
+    Maintained incrementally by the task write paths so statistics can be
+    read without aggregating the tasks table.
+    """
+    __tablename__ = "task_stats"
+    
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    dimension = Column(String(20), primary_key=True)  # "status", "priority" or "category"
+    key = Column(String(64), primary_key=True)  # Enum value, category id or "none"
+    count = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, String, UUID, ForeignKey, DateTime, Index
+from database.base import Base
+from datetime import datetime
+import uuid
+
+
+class Tombstone(Base):
+    """Record of a deleted task or category, kept for delta sync clients."""
+    __tablename__ = "tombstones"
+    
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    entity_type = Column(String(20), nullable=False)  # "task" or "category"
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    deleted_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_tombstones_user_deleted", "user_id", "deleted_at"),
+    )
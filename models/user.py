@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, UUID
+from sqlalchemy import Column, String, Integer, UUID
 from sqlalchemy.orm import relationship
 from database.base import Base, TimestampMixin
 import uuid
@@ -13,6 +13,8 @@ class User(Base, TimestampMixin):
     password_hash = Column(String(255), nullable=False)
     first_name = Column(String(100), nullable=True)
     last_name = Column(String(100), nullable=True)
+    # Bumped by every write to the user's tasks or categories; drives ETags
+    data_version = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     tasks = relationship("Task", back_populates="user", cascade="all, delete-orphan")
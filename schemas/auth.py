@@ -20,6 +20,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 class TokenData(BaseModel):
     user_id: Optional[UUID] = None
     token_type: Optional[str] = None
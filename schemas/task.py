@@ -1,7 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Literal, Union, Annotated
 from models.task import TaskStatus, TaskPriority
 
 
@@ -48,3 +48,81 @@ class TaskResponse(TaskBase):
 class TaskListResponse(BaseModel):
     tasks: list[TaskResponse]
     pagination: dict
+
+
+# Upper bound on operations accepted by POST /tasks/batch
+MAX_BATCH_OPERATIONS = 500
+
+
+class TaskBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskCreate
+
+
+class TaskBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: UUID
+    data: TaskUpdate
+
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: UUID
+
+
+TaskBatchOperation = Annotated[
+    Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete],
+    Field(discriminator="op")
+]
+
+
+class TaskBatchRequest(BaseModel):
+    operations: list[TaskBatchOperation] = Field(..., min_length=1, max_length=MAX_BATCH_OPERATIONS)
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    op: str
+    status: int
+    id: Optional[UUID] = None
+    task: Optional[TaskResponse] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: list[TaskBatchItemResult]
+
+
+class TombstoneResponse(BaseModel):
+    entity_type: str
+    entity_id: UUID
+    deleted_at: datetime
+    
+    model_config = ConfigDict(from_attributes=True)
+
+
+class TaskChangesResponse(BaseModel):
+    tasks: list[TaskResponse]
+    deleted: list[TombstoneResponse]
+    pagination: dict
+
+
+class TaskImportError(BaseModel):
+    line: int
+    error: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: list[TaskImportError]
+    errors_truncated: bool = False
+
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    by_status: dict[str, int]
+    by_priority: dict[str, int]
+    by_category: dict[str, int]  # Keyed by category id, "none" for uncategorized
+    overdue: int
+    due_this_week: int
@@ -1,10 +1,18 @@
+import os
+
+# Fail any test whose requests exceed their endpoint's SQL budget
+os.environ.setdefault("QUERY_BUDGET_MODE", "raise")
+
 import pytest
 import asyncio
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from database.base import Base
-from database.session import get_db
+from database.session import get_db, get_session_factory
 from main import app
+from utils.query_budget import install_query_budget
+from utils.token_bucket import api_rate_limiter
 from config.settings import settings
 
 # Test database URL
@@ -13,6 +21,15 @@ TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 # Create test engine
 test_engine = create_async_engine(TEST_DATABASE_URL, echo=False)
 TestSessionLocal = async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+install_query_budget(test_engine)
+
+
+@event.listens_for(test_engine.sync_engine, "connect")
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record):
+    """Enforce foreign keys (and ON DELETE actions) like Postgres does."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
 
 
 @pytest.fixture(scope="session")
@@ -43,8 +60,45 @@ async def client(db_session):
         yield db_session
     
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_session_factory] = lambda: TestSessionLocal
+    app.state.limiter.reset()
+    api_rate_limiter.reset()
     
     async with AsyncClient(app=app, base_url="http://test") as ac:
         yield ac
     
     app.dependency_overrides.clear()
+
+
+@pytest.fixture(scope="function")
+async def auth_headers(client):
+    """Register and log in a user, returning an Authorization header."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "taskuser",
+            "email": "tasks@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={
+            "email": "tasks@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="function")
+def query_counter():
+    """Collect the SQL statements executed on the test engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(test_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
@@ -1,5 +1,12 @@
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import func, select
+from config.settings import settings
+from core import security
+from core.security import create_access_token, decode_token, token_cache_stats
+from models.revoked_token import RevokedToken
+from models.user import User
+from utils.revocation import revoked_tokens, sync_revocations
 
 
 @pytest.mark.asyncio
@@ -47,3 +54,121 @@ async def test_login_user(client: AsyncClient):
     assert "accessToken" in data
     assert "refreshToken" in data
     assert data["tokenType"] == "Bearer"
+
+
+@pytest.mark.asyncio
+async def test_register_rejected_when_hash_pool_full(client: AsyncClient, monkeypatch):
+    """Password hashing sheds load with a 503 once the pool and queue are full."""
+    monkeypatch.setattr(settings, "PASSWORD_HASH_WORKERS", 0)
+    monkeypatch.setattr(settings, "PASSWORD_HASH_QUEUE_LIMIT", 0)
+    
+    response = await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "busyuser",
+            "email": "busy@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+
+
+def test_decode_token_caches_verified_payload():
+    """Verified tokens are served from cache; forged ones are never accepted."""
+    token = create_access_token(data={"sub": "cached-user"})
+    assert decode_token(token)["sub"] == "cached-user"
+    
+    hits = token_cache_stats()["hits"]
+    payload = decode_token(token)
+    assert payload["sub"] == "cached-user"
+    assert token_cache_stats()["hits"] == hits + 1
+    
+    payload["sub"] = "mutated"
+    assert decode_token(token)["sub"] == "cached-user"
+    assert decode_token(token[:-2] + "xx") is None
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_tokens(client: AsyncClient, db_session):
+    """Logout revokes both the access and the refresh token."""
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "logoutuser",
+            "email": "logout@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    tokens = (await client.post(
+        "/api/v1/auth/login",
+        json={
+            "email": "logout@example.com",
+            "password": "Test123!@#"
+        }
+    )).json()
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    
+    response = await client.get("/api/v1/categories", headers=headers)
+    assert response.status_code == 200
+    
+    response = await client.post(
+        "/api/v1/auth/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 200
+    
+    response = await client.get("/api/v1/categories", headers=headers)
+    assert response.status_code == 401
+    
+    response = await client.post("/api/v1/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+    
+    assert await db_session.scalar(select(func.count()).select_from(RevokedToken)) == 2
+    
+    # A fresh worker picks the revocations up from the table
+    revoked_tokens.clear()
+    await sync_revocations(db_session)
+    assert len(revoked_tokens) == 2
+
+
+@pytest.mark.asyncio
+async def test_login_rehashes_at_new_cost(client: AsyncClient, db_session, monkeypatch):
+    """Login upgrades a stored hash made at an old bcrypt cost."""
+    monkeypatch.setattr(security, "_bcrypt_rounds", 4)
+    await client.post(
+        "/api/v1/auth/register",
+        json={
+            "username": "rehashuser",
+            "email": "rehash@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    user = await db_session.scalar(select(User).where(User.email == "rehash@example.com"))
+    assert user.password_hash.startswith("$2b$04$")
+    
+    security.set_bcrypt_rounds(5)
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={
+            "email": "rehash@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    assert response.status_code == 200
+    
+    await db_session.refresh(user)
+    assert user.password_hash.startswith("$2b$05$")
+    assert not security.password_needs_rehash(user.password_hash)
+    
+    # A worker at a lower cost keeps the stronger hash
+    security.set_bcrypt_rounds(4)
+    response = await client.post(
+        "/api/v1/auth/login",
+        json={
+            "email": "rehash@example.com",
+            "password": "Test123!@#"
+        }
+    )
+    assert response.status_code == 200
+    await db_session.refresh(user)
+    assert user.password_hash.startswith("$2b$05$")
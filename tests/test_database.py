@@ -0,0 +1,131 @@
+import time
+import uuid
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.requests import Request
+from database import session as session_module
+from database.base import Base
+from database.schema import check_schema_revision, create_tables, script_directory
+from models.category import Category
+from models.user import User
+
+
+@pytest.mark.asyncio
+async def test_get_db_read_only_sessions(tmp_path, monkeypatch):
+    """Sessions for safe methods check out lazily and are never committed."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/session.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    factory = async_sessionmaker(engine, expire_on_commit=False)
+    monkeypatch.setattr(session_module, "AsyncSessionLocal", factory)
+    
+    async with factory() as db:
+        user = User(username="reader", email="reader@example.com", password_hash="x")
+        db.add(user)
+        await db.commit()
+    
+    async def run(method):
+        dependency = session_module.get_db(Request({"type": "http", "method": method, "headers": []}))
+        session = await dependency.__anext__()
+        assert engine.pool.checkedout() == 0
+        session.add(Category(user_id=user.id, name=f"From {method}"))
+        await session.flush()
+        with pytest.raises(StopAsyncIteration):
+            await dependency.__anext__()
+        assert engine.pool.checkedout() == 0
+        
+        async with factory() as db:
+            return await db.scalar(select(func.count()).select_from(Category))
+    
+    assert await run("GET") == 0
+    assert await run("POST") == 1
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_read_replica_routing(tmp_path, monkeypatch):
+    """Read-only sessions use a replica unless the user wrote recently."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/primary.db")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/replica.db")
+    for name, target in (("primary", primary), ("replica", replica)):
+        async with target.begin() as conn:
+            await conn.execute(text("CREATE TABLE node (name TEXT)"))
+            await conn.execute(text(f"INSERT INTO node VALUES ('{name}')"))
+    
+    monkeypatch.setattr(session_module, "engine", primary)
+    monkeypatch.setattr(session_module, "replicas", session_module.ReplicaRouter([replica]))
+    factory = async_sessionmaker(primary, sync_session_class=session_module.RoutingSession)
+    user_id = uuid.uuid4()
+    
+    async def node(read_only, **info):
+        async with factory() as session:
+            session.info.update(read_only=read_only, user_id=user_id, **info)
+            return await session.scalar(text("SELECT name FROM node"))
+    
+    assert await node(read_only=True) == "replica"
+    assert await node(read_only=False) == "primary"
+    assert await node(read_only=True, primary=True) == "primary"
+    
+    session_module.stick_to_primary(user_id)
+    assert await node(read_only=True) == "primary"
+    
+    session_module.replicas.mark_down(replica)
+    assert session_module.replicas.choose() is None
+    await session_module.replicas.check_health()
+    assert session_module.replicas.choose() is replica
+    
+    await primary.dispose()
+    await replica.dispose()
+
+
+@pytest.mark.asyncio
+async def test_startup_schema_check(tmp_path):
+    """Startup accepts only a database migrated to head."""
+    unreachable = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/missing/schema.db")
+    with pytest.raises(OperationalError, match="unable to open database file"):
+        await check_schema_revision(unreachable)
+    
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/schema.db")
+    with pytest.raises(RuntimeError, match="not versioned"):
+        await check_schema_revision(engine)
+    
+    async with engine.begin() as conn:
+        await conn.run_sync(create_tables)
+    assert await check_schema_revision(engine) == script_directory().get_current_head()
+    
+    async with engine.begin() as conn:
+        await conn.execute(text("UPDATE alembic_version SET version_num = '0001'"))
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await check_schema_revision(engine)
+    
+    await engine.dispose()
+
+
+def test_primary_cookie_signature():
+    """Only untampered stickiness cookies are honoured."""
+    cookie = session_module.primary_cookie(time.time() + 5)
+    assert session_module.primary_cookie_until(cookie) > time.time()
+    
+    until, _, signature = cookie.partition(".")
+    assert session_module.primary_cookie_until(f"{int(until) + 60}.{signature}") == 0
+    assert session_module.primary_cookie_until("garbage") == 0
+    assert session_module.primary_cookie_until(None) == 0
+
+
+@pytest.mark.asyncio
+async def test_primary_stickiness_cookie(client: AsyncClient, auth_headers: dict, monkeypatch):
+    """Successful writes tell the client to read from the primary for a while."""
+    monkeypatch.setattr(session_module.replicas, "engines", [object()])
+    
+    response = await client.post("/api/v1/tasks", json={"title": "Sticky"}, headers=auth_headers)
+    assert response.status_code == 201
+    cookie = response.cookies[session_module.PRIMARY_COOKIE]
+    assert session_module.primary_cookie_until(cookie) > time.time()
+    
+    response = await client.post("/api/v1/tasks", json={"title": ""}, headers=auth_headers)
+    assert "set-cookie" not in response.headers
+    response = await client.get("/api/v1/tasks", headers=auth_headers)
+    assert "set-cookie" not in response.headers
@@ -0,0 +1,47 @@
+from collections import Counter
+import pytest
+from httpx import AsyncClient
+from main import app
+from utils.metrics import metrics_response
+from utils.query_budget import QueryBudgetExceeded, QueryBudgetMiddleware, statement_shape
+
+
+@pytest.mark.asyncio
+async def test_metrics_and_server_timing(client: AsyncClient, auth_headers: dict):
+    """Responses carry Server-Timing and routes show up in /metrics by template."""
+    await client.post("/api/v1/tasks", json={"title": "Timed"}, headers=auth_headers)
+    task_id = (await client.get("/api/v1/tasks", headers=auth_headers)).json()["tasks"][0]["id"]
+    
+    response = await client.get(f"/api/v1/tasks/{task_id}", headers=auth_headers)
+    phases = [part.split(";")[0] for part in response.headers["server-timing"].split(", ")]
+    assert phases == ["auth", "db", "serialize", "total"]
+    
+    body = (await client.get("/metrics")).text
+    assert 'taskflow_http_request_duration_seconds_count{method="GET",route="/api/v1/tasks/{task_id}",status="200"}' in body
+    assert "taskflow_http_requests_in_flight" in body
+    assert task_id not in body
+
+
+@pytest.mark.asyncio
+async def test_query_budget_enforced(client: AsyncClient, auth_headers: dict, monkeypatch):
+    """Requests over their endpoint's SQL budget, or repeating a statement, fail."""
+    endpoint = next(
+        route.endpoint for route in app.routes
+        if getattr(route, "path", None) == "/api/v1/tasks" and "GET" in route.methods
+    )
+    monkeypatch.setattr(endpoint, "query_budget", 0)
+    with pytest.raises(QueryBudgetExceeded, match="budget is 0"):
+        await client.get("/api/v1/tasks", headers=auth_headers)
+    
+    shape = statement_shape("SELECT * FROM categories WHERE id IN (?, ?,\n ?)")
+    assert shape == statement_shape("SELECT * FROM categories WHERE id IN (?)")
+    problems = QueryBudgetMiddleware._check(endpoint, Counter({shape: 3}))
+    assert any("N+1" in problem for problem in problems)
+
+
+def test_multiprocess_metrics_include_pools(tmp_path, monkeypatch):
+    """Pool gauges are exported in multiprocess mode too."""
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    
+    body = metrics_response().body.decode()
+    assert 'taskflow_db_pool_size{pool="primary"}' in body
@@ -0,0 +1,90 @@
+import sqlite3
+import time
+import pytest
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from utils.token_bucket import TokenBucketLimiter, api_rate_limiter
+
+
+def test_sqlite_storage_shared_between_workers(tmp_path):
+    """Two storages on one file enforce a single limit, as two workers would."""
+    uri = f"sqlite:///{tmp_path}/ratelimit.db"
+    worker_a = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    worker_b = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    limit = parse("5/hour")
+    
+    results = [(worker_a if i % 2 else worker_b).hit(limit, "login", "1.2.3.4") for i in range(7)]
+    assert results == [True] * 5 + [False] * 2
+    assert worker_a.get_window_stats(limit, "login", "1.2.3.4").remaining == 0
+    
+    # Other keys are counted separately
+    assert worker_b.hit(limit, "login", "5.6.7.8")
+    
+    worker_a.clear(limit, "login", "1.2.3.4")
+    assert worker_b.hit(limit, "login", "1.2.3.4")
+
+
+def test_sqlite_storage_counters_expire(tmp_path):
+    """Fixed-window counters restart once expired."""
+    storage = storage_from_string(f"sqlite:///{tmp_path}/ratelimit.db")
+    assert storage.incr("key", expiry=-1) == 1
+    assert storage.incr("key", expiry=60) == 1
+    assert storage.incr("key", expiry=60) == 2
+    assert storage.get("key") == 2
+    assert storage.reset() == 1
+    assert storage.get("key") == 0
+
+
+def test_sqlite_storage_fails_open_when_locked(tmp_path):
+    """A worker holding the write lock doesn't stall or block other workers."""
+    path = tmp_path / "ratelimit.db"
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(f"sqlite:///{path}"))
+    limit = parse("1/hour")
+    assert limiter.hit(limit, "login", "1.2.3.4")
+    
+    other_worker = sqlite3.connect(path, isolation_level=None)
+    other_worker.execute("BEGIN IMMEDIATE")
+    try:
+        started = time.monotonic()
+        assert limiter.hit(limit, "login", "1.2.3.4")
+        assert time.monotonic() - started < 1
+    finally:
+        other_worker.execute("ROLLBACK")
+        other_worker.close()
+    
+    assert not limiter.hit(limit, "login", "1.2.3.4")
+
+
+@pytest.mark.asyncio
+async def test_api_token_bucket_per_user(client, auth_headers, monkeypatch):
+    """API routes share a per-user bucket; expensive routes cost more."""
+    monkeypatch.setattr(api_rate_limiter, "capacity", 12.0)
+    monkeypatch.setattr(api_rate_limiter, "rate", 1.0)
+    api_rate_limiter.reset()
+    
+    assert (await client.get("/api/v1/tasks/export", headers=auth_headers)).status_code == 200
+    assert (await client.get("/api/v1/tasks", headers=auth_headers)).status_code == 200
+    assert (await client.get("/api/v1/tasks", headers=auth_headers)).status_code == 200
+    
+    response = await client.get("/api/v1/tasks", headers=auth_headers)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    
+    # Anonymous requests are limited by address, separately from the user
+    assert (await client.get("/api/v1/categories")).status_code != 429
+    assert (await client.get("/health")).status_code == 200
+
+
+def test_token_bucket_sustained_rate(monkeypatch):
+    """A bucket in constant use keeps its state instead of expiring full."""
+    clock = [1000.0]
+    monkeypatch.setattr("time.monotonic", lambda: clock[0])
+    limiter = TokenBucketLimiter(per_minute=60, burst=60, max_clients=10)
+    
+    # 10 req/s for 300 s against 1 token/s: the burst plus one per second
+    allowed = 0
+    for _ in range(3000):
+        allowed += limiter.acquire("user:1") == 0.0
+        clock[0] += 0.1
+    assert 355 <= allowed <= 361
@@ -0,0 +1,535 @@
+import pytest
+from datetime import datetime, timedelta
+from uuid import UUID, uuid4
+from httpx import AsyncClient
+from sqlalchemy import event, select, text, update
+from config.settings import settings
+from models.task import Task
+from models.user import User
+from utils.pagination import encode_cursor, keyset_condition, keyset_order
+from utils.search import _fts5_query, _prefix_tsquery
+from utils.task_stats import get_task_stats, rebuild_task_stats
+from utils.user_cache import clear_user_cache, user_cache_stats
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_cursor_pagination(client: AsyncClient, auth_headers: dict):
+    """Test walking the task list with keyset cursors."""
+    for i in range(5):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=auth_headers)
+    
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = await client.get("/api/v1/tasks", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        seen.extend(task["id"] for task in data["tasks"])
+        cursor = data["pagination"]["nextCursor"]
+        if cursor is None:
+            break
+    
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_invalid_cursor(client: AsyncClient, auth_headers: dict):
+    """Test that a malformed cursor is rejected."""
+    response = await client.get(
+        "/api/v1/tasks", params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_count_modes(client: AsyncClient, auth_headers: dict):
+    """Test count modes and count cache invalidation on writes."""
+    for i in range(3):
+        await client.post("/api/v1/tasks", json={"title": f"Task {i}"}, headers=auth_headers)
+    
+    response = await client.get("/api/v1/tasks", params={"page": 1}, headers=auth_headers)
+    pagination = response.json()["pagination"]
+    assert pagination["totalItems"] == 3
+    assert pagination["totalItemsExact"] is True
+    
+    await client.post("/api/v1/tasks", json={"title": "Task 3"}, headers=auth_headers)
+    response = await client.get("/api/v1/tasks", params={"page": 1}, headers=auth_headers)
+    assert response.json()["pagination"]["totalItems"] == 4
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"page": 1, "count": "none"}, headers=auth_headers
+    )
+    assert response.json()["pagination"]["totalItems"] is None
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"count": "estimate"}, headers=auth_headers
+    )
+    assert response.json()["pagination"]["totalItems"] == 4
+
+
+@pytest.mark.asyncio
+async def test_search_tasks(client: AsyncClient, auth_headers: dict):
+    """Test full-text search matches words in title and description."""
+    await client.post("/api/v1/tasks", json={"title": "Buy milk"}, headers=auth_headers)
+    await client.post(
+        "/api/v1/tasks",
+        json={"title": "Groceries", "description": "milk, eggs and more milk"},
+        headers=auth_headers
+    )
+    await client.post("/api/v1/tasks", json={"title": "Write report"}, headers=auth_headers)
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"search": "milk", "limit": 1}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["tasks"]) == 1
+    
+    response = await client.get(
+        "/api/v1/tasks",
+        params={"search": "milk", "cursor": data["pagination"]["nextCursor"]},
+        headers=auth_headers
+    )
+    titles = {task["title"] for task in data["tasks"] + response.json()["tasks"]}
+    assert titles == {"Buy milk", "Groceries"}
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"search": "repo", "page": 1}, headers=auth_headers
+    )
+    assert response.json()["pagination"]["totalItems"] == 1
+
+
+def test_search_prefix_queries():
+    """Test both search indexes get the same ANDed prefix terms."""
+    assert _fts5_query('repo "q3') == '"repo"* """q3"*'
+    assert _prefix_tsquery("repo 'q3 & !x") == "repo:* & q3:* & x:*"
+    assert _prefix_tsquery(" :* ") == ""
+
+
+@pytest.mark.asyncio
+async def test_search_survives_rowid_renumbering(client: AsyncClient, auth_headers: dict, db_session):
+    """Test the SQLite search index doesn't depend on the implicit rowid VACUUM may change."""
+    await client.post("/api/v1/tasks", json={"title": "Write report"}, headers=auth_headers)
+    await client.post("/api/v1/tasks", json={"title": "Buy milk"}, headers=auth_headers)
+    await db_session.execute(text("UPDATE tasks SET rowid = rowid + 1000"))
+    await db_session.commit()
+    
+    response = await client.get("/api/v1/tasks", params={"search": "report"}, headers=auth_headers)
+    assert [task["title"] for task in response.json()["tasks"]] == ["Write report"]
+
+
+@pytest.mark.asyncio
+async def test_sort_by_priority_uses_ordinal(client: AsyncClient, auth_headers: dict):
+    """Test that priority sorts by severity rather than alphabetically."""
+    for priority in ["LOW", "URGENT", "MEDIUM", "HIGH"]:
+        await client.post(
+            "/api/v1/tasks", json={"title": priority, "priority": priority}, headers=auth_headers
+        )
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"sort_by": "priority", "limit": 2}, headers=auth_headers
+    )
+    data = response.json()
+    response = await client.get(
+        "/api/v1/tasks",
+        params={"sort_by": "priority", "cursor": data["pagination"]["nextCursor"]},
+        headers=auth_headers
+    )
+    priorities = [task["priority"] for task in data["tasks"] + response.json()["tasks"]]
+    assert priorities == ["URGENT", "HIGH", "MEDIUM", "LOW"]
+
+
+@pytest.mark.asyncio
+async def test_sort_by_priority_uses_index(db_session):
+    """Test priority pages are read in index order without a sort step."""
+    plan = await db_session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT id FROM tasks WHERE user_id = :user_id "
+        "ORDER BY priority_rank DESC, id DESC LIMIT 20"
+    ), {"user_id": "x"})
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_tasks_user_priority" in details
+    assert "TEMP B-TREE" not in details
+
+
+@pytest.mark.asyncio
+async def test_keyset_condition_bounds_index_scan(db_session):
+    """Test a keyset page starts its index scan at the cursor."""
+    query = (
+        select(Task.id)
+        .where(Task.user_id == uuid4())
+        .where(keyset_condition(Task.created_at, Task.id, datetime.utcnow(), uuid4(), "desc"))
+        .order_by(*keyset_order(Task.created_at, Task.id, "desc"))
+        .limit(20)
+    )
+    compiled = query.compile(db_session.bind)
+    connection = await db_session.connection()
+    plan = await connection.exec_driver_sql(
+        "EXPLAIN QUERY PLAN " + str(compiled), tuple(None for _ in compiled.positiontup)
+    )
+    details = " ".join(row[-1] for row in plan)
+    assert "ix_tasks_user_created (user_id=? AND (created_at,id)<(?,?))" in details
+
+
+@pytest.mark.asyncio
+async def test_batch_tasks(client: AsyncClient, auth_headers: dict):
+    """Test mixed create/update/delete operations in one batch."""
+    first = (await client.post("/api/v1/tasks", json={"title": "First"}, headers=auth_headers)).json()
+    second = (await client.post("/api/v1/tasks", json={"title": "Second"}, headers=auth_headers)).json()
+    
+    response = await client.post(
+        "/api/v1/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": "New one"}},
+                {"op": "create", "data": {"title": "New two", "priority": "HIGH"}},
+                {"op": "update", "id": first["id"], "data": {"status": "COMPLETED"}},
+                {"op": "delete", "id": second["id"]},
+                {"op": "delete", "id": "00000000-0000-0000-0000-000000000000"}
+            ]
+        },
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == [201, 201, 200, 204, 404]
+    assert results[1]["task"]["priority"] == "HIGH"
+    assert results[2]["task"]["status"] == "COMPLETED"
+    
+    response = await client.get("/api/v1/tasks", params={"page": 1}, headers=auth_headers)
+    titles = {task["title"] for task in response.json()["tasks"]}
+    assert titles == {"First", "New one", "New two"}
+
+
+@pytest.mark.asyncio
+async def test_batch_delete_counts_removed_rows(client: AsyncClient, auth_headers: dict, db_session):
+    """Test a batch delete racing another delete only counts rows it removed."""
+    task = (await client.post("/api/v1/tasks", json={"title": "Raced"}, headers=auth_headers)).json()
+    user_id = UUID(task["user_id"])
+    before = await get_task_stats(db_session, user_id)
+    
+    # Another request deletes the task (and owns its counters) just before the batch's DELETE
+    def delete_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM tasks"):
+            cursor.execute("DELETE FROM tasks WHERE title = 'Raced'")
+    
+    engine = db_session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", delete_first)
+    try:
+        response = await client.post(
+            "/api/v1/tasks/batch", json={"operations": [{"op": "delete", "id": task["id"]}]}, headers=auth_headers
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", delete_first)
+    assert [r["status"] for r in response.json()["results"]] == [404]
+    assert await get_task_stats(db_session, user_id) == before
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_query_count(client: AsyncClient, auth_headers: dict, query_counter: list):
+    """Test that a 100-task page loads categories without per-row queries."""
+    category = (await client.post(
+        "/api/v1/categories", json={"name": "Work", "color": "#FF0000"}, headers=auth_headers
+    )).json()
+    await client.post(
+        "/api/v1/tasks/batch",
+        json={
+            "operations": [
+                {"op": "create", "data": {"title": f"Task {i}", "category_id": category["id"]}}
+                for i in range(100)
+            ]
+        },
+        headers=auth_headers
+    )
+    
+    query_counter.clear()
+    response = await client.get("/api/v1/tasks", params={"limit": 100}, headers=auth_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["tasks"]) == 100
+    assert all(task["category"]["name"] == "Work" for task in data["tasks"])
+    # User lookup, data version and the page itself
+    assert len(query_counter) <= 3
+    
+    query_counter.clear()
+    response = await client.get(f"/api/v1/tasks/{data['tasks'][0]['id']}", headers=auth_headers)
+    assert response.json()["category"]["name"] == "Work"
+    assert len(query_counter) <= 3
+
+
+@pytest.mark.asyncio
+async def test_list_tasks_etag(client: AsyncClient, auth_headers: dict):
+    """Test conditional GETs return 304 until the user's data changes."""
+    await client.post("/api/v1/tasks", json={"title": "First"}, headers=auth_headers)
+    
+    response = await client.get("/api/v1/tasks", headers=auth_headers)
+    etag = response.headers["etag"]
+    
+    response = await client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
+    
+    response = await client.get(
+        "/api/v1/tasks", params={"limit": 5}, headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    
+    await client.post("/api/v1/categories", json={"name": "Home"}, headers=auth_headers)
+    response = await client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_etag_sees_other_worker_writes(client: AsyncClient, auth_headers: dict, db_session):
+    """Test a data version bumped elsewhere invalidates ETags despite the user cache."""
+    await client.post("/api/v1/tasks", json={"title": "First"}, headers=auth_headers)
+    etag = (await client.get("/api/v1/tasks", headers=auth_headers)).headers["etag"]
+    
+    # Another worker's write bumps the version without touching this worker's cache
+    await db_session.execute(update(User).values(data_version=User.data_version + 1))
+    await db_session.commit()
+    
+    response = await client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_task_changes(client: AsyncClient, auth_headers: dict):
+    """Test delta sync returns updated tasks and deletion tombstones."""
+    first = (await client.post("/api/v1/tasks", json={"title": "First"}, headers=auth_headers)).json()
+    second = (await client.post("/api/v1/tasks", json={"title": "Second"}, headers=auth_headers)).json()
+    
+    response = await client.get("/api/v1/tasks/changes", params={"limit": 1}, headers=auth_headers)
+    data = response.json()
+    assert len(data["tasks"]) == 1
+    assert data["pagination"]["hasMore"] is True
+    
+    response = await client.get(
+        "/api/v1/tasks/changes",
+        params={"since": data["pagination"]["nextCursor"]},
+        headers=auth_headers
+    )
+    data = response.json()
+    assert len(data["tasks"]) == 1
+    assert data["pagination"]["hasMore"] is False
+    cursor = data["pagination"]["nextCursor"]
+    
+    await client.patch(f"/api/v1/tasks/{first['id']}", json={"title": "Renamed"}, headers=auth_headers)
+    await client.delete(f"/api/v1/tasks/{second['id']}", headers=auth_headers)
+    
+    response = await client.get("/api/v1/tasks/changes", params={"since": cursor}, headers=auth_headers)
+    data = response.json()
+    assert [task["title"] for task in data["tasks"]] == ["Renamed"]
+    assert [(d["entity_type"], d["entity_id"]) for d in data["deleted"]] == [("task", second["id"])]
+
+
+@pytest.mark.asyncio
+async def test_task_changes_pages_through_old_tasks(client: AsyncClient, auth_headers: dict, db_session):
+    """Test an initial sync can page past tasks older than tombstone retention."""
+    for i in range(5):
+        await client.post("/api/v1/tasks", json={"title": f"Old {i}"}, headers=auth_headers)
+    await db_session.execute(update(Task).values(updated_at=datetime.utcnow() - timedelta(days=60)))
+    await db_session.commit()
+    
+    titles, params = [], {"limit": 2}
+    while True:
+        response = await client.get("/api/v1/tasks/changes", params=params, headers=auth_headers)
+        assert response.status_code == 200
+        data = response.json()
+        titles += [task["title"] for task in data["tasks"]]
+        params = {"limit": 2, "since": data["pagination"]["nextCursor"]}
+        if not data["pagination"]["hasMore"]:
+            break
+    assert sorted(titles) == [f"Old {i}" for i in range(5)]
+    
+    stale = encode_cursor("updated_at", datetime.utcnow() - timedelta(days=60), None)
+    response = await client.get("/api/v1/tasks/changes", params={"since": stale}, headers=auth_headers)
+    assert response.status_code == 410
+
+
+@pytest.mark.asyncio
+async def test_export_tasks(client: AsyncClient, auth_headers: dict):
+    """Test streaming export in both formats with filters applied."""
+    await client.post("/api/v1/tasks", json={"title": "Open"}, headers=auth_headers)
+    await client.post(
+        "/api/v1/tasks", json={"title": "Done, finally", "status": "COMPLETED"}, headers=auth_headers
+    )
+    
+    response = await client.get("/api/v1/tasks/export", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert len(lines) == 2
+    
+    response = await client.get(
+        "/api/v1/tasks/export", params={"format": "csv", "status": "COMPLETED"}, headers=auth_headers
+    )
+    rows = response.text.splitlines()
+    assert rows[0].startswith("id,title,")
+    assert len(rows) == 2
+    assert '"Done, finally"' in rows[1]
+
+
+@pytest.mark.asyncio
+async def test_import_tasks(client: AsyncClient, auth_headers: dict):
+    """Test NDJSON and CSV imports report per-line errors."""
+    body = "\n".join([
+        '{"title": "From NDJSON", "priority": "HIGH"}',
+        'not json',
+        '{"title": ""}',
+        '',
+        '{"title": "Another"}'
+    ])
+    response = await client.post("/api/v1/tasks/import", content=body, headers=auth_headers)
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["imported"] == 2
+    assert summary["failed"] == 2
+    assert [error["line"] for error in summary["errors"]] == [2, 3]
+    
+    body = 'title,description,status\n"CSV task","spans\ntwo lines",IN_PROGRESS\n,missing title,\n'
+    response = await client.post(
+        "/api/v1/tasks/import", params={"format": "csv"}, content=body, headers=auth_headers
+    )
+    summary = response.json()
+    assert summary["imported"] == 1
+    assert summary["errors"][0]["line"] == 4
+    
+    response = await client.get("/api/v1/tasks", params={"page": 1}, headers=auth_headers)
+    tasks = {task["title"]: task for task in response.json()["tasks"]}
+    assert set(tasks) == {"From NDJSON", "Another", "CSV task"}
+    assert tasks["CSV task"]["description"] == "spans\ntwo lines"
+
+
+@pytest.mark.asyncio
+async def test_import_bounds_record_length(client: AsyncClient, auth_headers: dict, monkeypatch):
+    """Test a stray quote or missing newline fails one record, not the import."""
+    monkeypatch.setattr(settings, "IMPORT_MAX_RECORD_LENGTH", 100)
+    
+    rows = [f"Row {i},filler text" for i in range(20)]
+    body = "\n".join(['title,description', 'Bad "quote,oops', *rows, 'Tail,ok'])
+    response = await client.post(
+        "/api/v1/tasks/import", params={"format": "csv"}, content=body, headers=auth_headers
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["errors"] == [{"line": 2, "error": "Record too long"}]
+    assert summary["imported"] > 0
+    
+    body = "\n".join(['{"title": "' + "x" * 200 + '"}', '{"title": "Short"}'])
+    response = await client.post("/api/v1/tasks/import", content=body, headers=auth_headers)
+    summary = response.json()
+    assert summary["imported"] == 1
+    assert summary["errors"] == [{"line": 1, "error": "Record too long"}]
+    
+    response = await client.get("/api/v1/tasks", params={"search": "Tail"}, headers=auth_headers)
+    assert [task["title"] for task in response.json()["tasks"]] == ["Tail"]
+
+
+@pytest.mark.asyncio
+async def test_task_stats(client: AsyncClient, auth_headers: dict, db_session):
+    """Test incrementally maintained counters match a full rebuild."""
+    category = (await client.post("/api/v1/categories", json={"name": "Work"}, headers=auth_headers)).json()
+    overdue = (datetime.utcnow() - timedelta(days=1)).isoformat()
+    soon = (datetime.utcnow() + timedelta(days=2)).isoformat()
+    first = (await client.post(
+        "/api/v1/tasks", json={"title": "Late", "due_date": overdue, "category_id": category["id"]}, headers=auth_headers
+    )).json()
+    await client.post("/api/v1/tasks", json={"title": "Soon", "due_date": soon, "priority": "HIGH"}, headers=auth_headers)
+    third = (await client.post("/api/v1/tasks", json={"title": "Gone"}, headers=auth_headers)).json()
+    await client.patch(f"/api/v1/tasks/{first['id']}", json={"status": "IN_PROGRESS"}, headers=auth_headers)
+    await client.delete(f"/api/v1/tasks/{third['id']}", headers=auth_headers)
+    
+    response = await client.get("/api/v1/tasks/stats", headers=auth_headers)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"TODO": 1, "IN_PROGRESS": 1, "COMPLETED": 0}
+    assert stats["by_priority"]["HIGH"] == 1
+    assert stats["by_category"] == {category["id"]: 1, "none": 1}
+    assert stats["overdue"] == 1
+    assert stats["due_this_week"] == 1
+    
+    user_id = UUID(first["user_id"])
+    incremental = await get_task_stats(db_session, user_id)
+    await rebuild_task_stats(db_session, user_id)
+    assert await get_task_stats(db_session, user_id) == incremental
+
+
+@pytest.mark.asyncio
+async def test_update_and_delete_ownership(client: AsyncClient, auth_headers: dict, query_counter: list):
+    """Test single-statement writes keep 404 vs 403 and return categories."""
+    category = (await client.post("/api/v1/categories", json={"name": "Work"}, headers=auth_headers)).json()
+    task = (await client.post(
+        "/api/v1/tasks", json={"title": "Mine", "category_id": category["id"]}, headers=auth_headers
+    )).json()
+    
+    query_counter.clear()
+    response = await client.patch(f"/api/v1/tasks/{task['id']}", json={"title": "Renamed"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["title"] == "Renamed"
+    assert response.json()["category"]["name"] == "Work"
+    assert not any(statement.lstrip().upper().startswith("SELECT tasks.id") for statement in query_counter)
+    
+    await client.post(
+        "/api/v1/auth/register",
+        json={"username": "intruder", "email": "intruder@example.com", "password": "Test123!@#"}
+    )
+    login = await client.post(
+        "/api/v1/auth/login", json={"email": "intruder@example.com", "password": "Test123!@#"}
+    )
+    intruder = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    
+    response = await client.patch(f"/api/v1/tasks/{task['id']}", json={"title": "Hacked"}, headers=intruder)
+    assert response.status_code == 403
+    response = await client.delete(f"/api/v1/tasks/{task['id']}", headers=intruder)
+    assert response.status_code == 403
+    response = await client.delete(f"/api/v1/categories/{category['id']}", headers=intruder)
+    assert response.status_code == 403
+    response = await client.delete("/api/v1/tasks/00000000-0000-0000-0000-000000000000", headers=auth_headers)
+    assert response.status_code == 404
+    
+    response = await client.delete(f"/api/v1/categories/{category['id']}", headers=auth_headers)
+    assert response.status_code == 204
+    response = await client.get(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    assert response.json()["category_id"] is None
+    
+    response = await client.delete(f"/api/v1/tasks/{task['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_update_category_name_conflict(client: AsyncClient, auth_headers: dict):
+    """Test the unique constraint surfaces as 409 on rename."""
+    await client.post("/api/v1/categories", json={"name": "Work"}, headers=auth_headers)
+    home = (await client.post("/api/v1/categories", json={"name": "Home"}, headers=auth_headers)).json()
+    
+    response = await client.patch(f"/api/v1/categories/{home['id']}", json={"name": "Work"}, headers=auth_headers)
+    assert response.status_code == 409
+    
+    response = await client.patch(f"/api/v1/categories/{home['id']}", json={"color": "#00FF00"}, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()["color"] == "#00FF00"
+
+
+@pytest.mark.asyncio
+async def test_current_user_cached(client: AsyncClient, auth_headers: dict, query_counter: list):
+    """Test authenticated requests reuse the cached user until it changes."""
+    clear_user_cache()
+    user_lookups = lambda: [s for s in query_counter if "users.password_hash" in s]
+    
+    await client.get("/api/v1/tasks", headers=auth_headers)
+    await client.get("/api/v1/tasks", headers=auth_headers)
+    assert len(user_lookups()) == 1
+    assert user_cache_stats()["hits"] >= 1
+    
+    etag = (await client.get("/api/v1/tasks", headers=auth_headers)).headers["etag"]
+    await client.post("/api/v1/tasks", json={"title": "New"}, headers=auth_headers)
+    response = await client.get("/api/v1/tasks", headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 200
+    # Task writes bump data_version, which is not cached, so the user stays cached
+    assert len(user_lookups()) == 1
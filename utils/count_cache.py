@@ -0,0 +1,35 @@
+from typing import Hashable, Optional
+from uuid import UUID
+from config.settings import settings
+from utils.cache import TTLCache
+
+# Filter combinations remembered per user before that user's entry is reset
+MAX_FILTERS_PER_USER = 64
+
+# user_id -> {filter key: total}; writes drop the whole per-user entry
+_counts = TTLCache(
+    maxsize=settings.COUNT_CACHE_MAX_USERS,
+    ttl=settings.COUNT_CACHE_TTL_SECONDS,
+)
+
+
+def get_cached_count(user_id: UUID, filters: Hashable) -> Optional[int]:
+    """Return the cached total for a user's filtered task list, if any."""
+    per_user = _counts.get(user_id)
+    if per_user is None:
+        return None
+    return per_user.get(filters)
+
+
+def set_cached_count(user_id: UUID, filters: Hashable, total: int) -> None:
+    """Remember the total for a user's filtered task list."""
+    per_user = _counts.get(user_id)
+    if per_user is None or len(per_user) >= MAX_FILTERS_PER_USER:
+        per_user = {}
+        _counts.set(user_id, per_user)
+    per_user[filters] = total
+
+
+def invalidate_user_counts(user_id: UUID) -> None:
+    """Forget every cached total for a user after their tasks change."""
+    _counts.pop(user_id)
@@ -0,0 +1,243 @@
+import functools
+import inspect
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "taskflow_http_request_duration_seconds",
+    "Time from receiving a request to finishing its response",
+    ["method", "route", "status"],
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "taskflow_http_requests_in_flight",
+    "Requests currently being handled",
+    multiprocess_mode="livesum",
+)
+DB_QUERY_LATENCY = Histogram(
+    "taskflow_db_query_duration_seconds",
+    "Time spent executing a single SQL statement",
+    ["route"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "taskflow_db_queries_per_request",
+    "SQL statements executed while handling a request",
+    ["route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "taskflow_db_pool_checkout_seconds",
+    "Time spent waiting for a pooled database connection",
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+
+# Label for requests that never reached a route (404s, rate-limit rejections)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestTimings:
+    """Where one request's time went; shared by every layer via a context var."""
+    
+    __slots__ = ("route", "auth", "db", "db_queries", "endpoint_done")
+    
+    def __init__(self):
+        self.route: Optional[str] = None
+        self.auth = 0.0
+        self.db = 0.0
+        self.db_queries = 0
+        self.endpoint_done: Optional[float] = None
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _timings.get()
+
+
+@contextmanager
+def timed_phase(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to the current request's ``phase``."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings = _timings.get()
+        if timings is not None:
+            setattr(timings, phase, getattr(timings, phase) + time.perf_counter() - started)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that records its path template and when its endpoint returned.
+    
+    The template labels metrics without the cardinality of raw paths; the
+    endpoint's return marks where response serialization starts.
+    """
+    
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _mark_endpoint_done(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+    
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        timings = _timings.get()
+        if timings is not None:
+            timings.route = self.path_format
+        await super().handle(scope, receive, send)
+
+
+def _mark_endpoint_done(endpoint):
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            timings = _timings.get()
+            if timings is not None:
+                timings.endpoint_done = time.perf_counter()
+    return wrapper
+
+
+class TimedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited."""
+    
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
+_pools: Dict[str, AsyncEngine] = {}
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Time every statement on ``engine`` and expose its pool's usage."""
+    _pools[name] = engine
+    sync_engine = engine.sync_engine
+    
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+    
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        timings = _timings.get()
+        if timings is None:
+            DB_QUERY_LATENCY.labels("background").observe(elapsed)
+            return
+        timings.db += elapsed
+        timings.db_queries += 1
+        DB_QUERY_LATENCY.labels(timings.route or UNMATCHED_ROUTE).observe(elapsed)
+    
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None:
+            started = context.connection.info.get("query_started")
+            if started:
+                started.pop()
+
+
+class PoolCollector:
+    """Pool size, usage and saturation of instrumented engines at scrape time."""
+    
+    def collect(self):
+        size = GaugeMetricFamily("taskflow_db_pool_size", "Connections the pool keeps open", labels=["pool"])
+        checked_out = GaugeMetricFamily("taskflow_db_pool_checked_out", "Connections in use", labels=["pool"])
+        saturation = GaugeMetricFamily(
+            "taskflow_db_pool_saturation", "Connections in use over the pool's limit", labels=["pool"]
+        )
+        for name, engine in _pools.items():
+            pool = engine.pool
+            if not isinstance(pool, QueuePool):
+                continue
+            limit = pool.size() + max(pool._max_overflow, 0)
+            size.add_metric([name], pool.size())
+            checked_out.add_metric([name], pool.checkedout())
+            saturation.add_metric([name], pool.checkedout() / limit if limit else 0)
+        yield size
+        yield checked_out
+        yield saturation
+
+
+REGISTRY.register(PoolCollector())
+
+
+def metrics_response() -> Response:
+    """Prometheus exposition of this process, or of all workers in multiprocess mode.
+    
+    Pool gauges are read live rather than from the shared files, so in
+    multiprocess mode they describe the pools of the worker that answered.
+    """
+    registry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        registry.register(PoolCollector())
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+class MetricsMiddleware:
+    """Record per-route latency and add a Server-Timing header to responses.
+    
+    Server-Timing splits the request into auth (get_current_user, including
+    its lookup), db (all SQL statements), serialize (endpoint return to
+    response start) and total, in milliseconds.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        timings = RequestTimings()
+        token = _timings.set(timings)
+        started = time.perf_counter()
+        status_code = 500
+        
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                now = time.perf_counter()
+                serialize = now - timings.endpoint_done if timings.endpoint_done else 0.0
+                header = (
+                    f"auth;dur={timings.auth * 1000:.1f}, db;dur={timings.db * 1000:.1f}, "
+                    f"serialize;dur={serialize * 1000:.1f}, total;dur={(now - started) * 1000:.1f}"
+                )
+                message["headers"] = list(message.get("headers", [])) + [(b"server-timing", header.encode())]
+            await send(message)
+        
+        REQUESTS_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            REQUESTS_IN_FLIGHT.dec()
+            route = timings.route or UNMATCHED_ROUTE
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(time.perf_counter() - started)
+            DB_QUERIES_PER_REQUEST.labels(route).observe(timings.db_queries)
+            _timings.reset(token)
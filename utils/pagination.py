@@ -0,0 +1,77 @@
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import and_, or_, tuple_
+from core.exceptions import BadRequestException
+
+
+def encode_cursor(sort_by: str, value: Any, row_id: Optional[UUID]) -> str:
+    """Encode the sort key of the last row on a page into an opaque cursor."""
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    elif isinstance(value, Enum):
+        value = value.value
+
+    payload = json.dumps(
+        {"s": sort_by, "v": value, "id": str(row_id) if row_id is not None else None},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str) -> Tuple[Optional[str], Optional[UUID]]:
+    """Decode a cursor produced by encode_cursor for the given sort column."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        row_id = UUID(payload["id"]) if payload["id"] is not None else None
+        value = payload["v"]
+    except (ValueError, KeyError, TypeError):
+        raise BadRequestException("Invalid cursor")
+
+    if payload.get("s") != sort_by:
+        raise BadRequestException("Cursor does not match the requested sort order")
+
+    return value, row_id
+
+
+def keyset_condition(column, id_column, value: Any, row_id: UUID, order: str):
+    """Build the WHERE clause selecting rows after (value, row_id).
+
+    NULLs sort after every value, so rows are expected to be ordered by
+    ``column`` ASC NULLS LAST or DESC NULLS FIRST and then by ``id_column`` in
+    the same direction. Both match a plain B-tree index scanned forwards or
+    backwards. Non-NULL positions compare (column, id) as a row value, which
+    the planner turns into an index range bound, so deep pages cost no more
+    than the first.
+    """
+    if order == "desc":
+        if value is None:
+            return or_(
+                and_(column.is_(None), id_column < row_id),
+                column.is_not(None),
+            )
+        return tuple_(column, id_column) < tuple_(value, row_id)
+
+    if value is None:
+        return and_(column.is_(None), id_column > row_id)
+
+    after = tuple_(column, id_column) > tuple_(value, row_id)
+    if _nullable(column):
+        return or_(after, column.is_(None))
+    return after
+
+
+def _nullable(column) -> bool:
+    """Whether ``column`` may hold NULLs; unknown for computed expressions."""
+    return getattr(getattr(column, "expression", column), "nullable", True)
+
+
+def keyset_order(column, id_column, order: str) -> tuple:
+    """ORDER BY clauses matching keyset_condition for the given direction."""
+    if order == "desc":
+        return column.desc().nulls_first(), id_column.desc()
+    return column.asc().nulls_last(), id_column.asc()
@@ -0,0 +1,99 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, Optional
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Collapses bound parameter lists so IN (?, ?, ?) and IN (?) share a shape
+_PARAMETER_LIST = re.compile(r"\(\s*(?:\?|%s|\$\d+|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|\$\d+|:\w+|%\(\w+\)s))*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceeded(AssertionError):
+    """A request ran more SQL than its route allows, or repeated a statement."""
+    pass
+
+
+def query_budget(max_queries: Optional[int], allow_repeats: bool = False) -> Callable:
+    """Declare how many SQL statements a request to this endpoint may run.
+    
+    The count covers the whole request, including the user lookup in
+    get_current_user. ``None`` and ``allow_repeats`` are for endpoints whose
+    work legitimately grows with the input, such as bulk import running the
+    same statements per batch.
+    """
+    def decorator(endpoint):
+        endpoint.query_budget = max_queries
+        endpoint.query_budget_allow_repeats = allow_repeats
+        return endpoint
+    return decorator
+
+
+def statement_shape(statement: str) -> str:
+    return _WHITESPACE.sub(" ", _PARAMETER_LIST.sub("(?)", statement)).strip()
+
+
+_statements: ContextVar[Optional[Counter]] = ContextVar("request_statements", default=None)
+
+
+def install_query_budget(engine: AsyncEngine) -> None:
+    """Count the statements each request runs on ``engine``."""
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        statements = _statements.get()
+        if statements is not None:
+            statements[statement_shape(statement)] += 1
+
+
+class QueryBudgetMiddleware:
+    """Check each request's SQL against its endpoint's query_budget.
+    
+    Enabled by QUERY_BUDGET_MODE: "warn" logs breaches (staging), "raise"
+    raises QueryBudgetExceeded once the response is sent, failing the test
+    that made the request. A statement shape repeated
+    QUERY_REPEAT_THRESHOLD times or more is reported as a likely N+1.
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        statements = Counter()
+        token = _statements.set(statements)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _statements.reset(token)
+        
+        problems = self._check(scope.get("endpoint"), statements)
+        if problems:
+            message = f"{scope['method']} {scope['path']}: " + "; ".join(problems)
+            if settings.QUERY_BUDGET_MODE == "raise":
+                raise QueryBudgetExceeded(message)
+            logger.warning("Query budget exceeded: %s", message)
+    
+    @staticmethod
+    def _check(endpoint, statements: Counter) -> list[str]:
+        budget = getattr(endpoint, "query_budget", settings.QUERY_BUDGET_DEFAULT)
+        problems = []
+        
+        total = sum(statements.values())
+        if budget is not None and total > budget:
+            problems.append(f"ran {total} SQL statements, budget is {budget}")
+        
+        if not getattr(endpoint, "query_budget_allow_repeats", False):
+            shape, repeats = statements.most_common(1)[0] if statements else ("", 0)
+            if repeats >= settings.QUERY_REPEAT_THRESHOLD:
+                problems.append(f"possible N+1, ran {repeats} times: {shape[:200]}")
+        
+        return problems
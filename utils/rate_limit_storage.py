@@ -0,0 +1,180 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from math import floor
+from typing import Optional, Tuple
+from limits.storage import SlidingWindowCounterSupport, Storage
+from limits.storage.base import TimestampedSlidingWindow
+
+logger = logging.getLogger(__name__)
+
+# Expired counters are swept after this many writes
+PURGE_EVERY = 1000
+
+# slowapi calls the storage synchronously on the event loop, so waiting for
+# another worker's lock must stay short; past it the request is let through
+BUSY_TIMEOUT_SECONDS = 0.05
+
+
+def _is_busy(exc: sqlite3.Error) -> bool:
+    return isinstance(exc, sqlite3.OperationalError) and "locked" in str(exc)
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate limit counters in a SQLite file shared by every worker on a host.
+    
+    Use with ``RATE_LIMIT_STORAGE_URI=sqlite:////var/run/taskflow/ratelimit.db``.
+    The file runs in WAL mode, so checks from concurrent workers do not
+    block each other's reads. Each limit key holds two fixed-window
+    counters (previous and current window), so a check is two primary-key
+    lookups and an upsert, and expired counters are swept periodically.
+    When another worker holds the write lock for longer than
+    BUSY_TIMEOUT_SECONDS, the check fails open and allows the request.
+    
+    It implements the same ``limits`` storage interface as the Redis and
+    Memcached backends; point the URI at one of those to share limits
+    across hosts instead.
+    """
+    
+    STORAGE_SCHEME = ["sqlite"]
+    
+    def __init__(self, uri: Optional[str] = None, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # As in SQLAlchemy URLs: sqlite:///relative.db, sqlite:////absolute.db
+        path = uri.split("://", 1)[1][1:] if uri else ""
+        self.path = path or ":memory:"
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+        self._writes = 0
+    
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+    
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not cross a fork, so each worker opens its own
+        if self._connection is None or self._pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS ix_rate_limits_expires_at ON rate_limits (expires_at)"
+            )
+            self._connection = connection
+            self._pid = os.getpid()
+        return self._connection
+    
+    def _get(self, connection: sqlite3.Connection, key: str, now: float) -> Tuple[int, float]:
+        row = connection.execute(
+            "SELECT count, expires_at FROM rate_limits WHERE key = ? AND expires_at > ?",
+            (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else (0, now)
+    
+    def _incr(self, connection: sqlite3.Connection, key: str, expiry: float, amount: int, now: float) -> int:
+        # Expired counters restart from zero with a fresh expiry
+        row = connection.execute(
+            "INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET "
+            "count = CASE WHEN expires_at > ? THEN count + excluded.count ELSE excluded.count END, "
+            "expires_at = CASE WHEN expires_at > ? THEN expires_at ELSE excluded.expires_at END "
+            "RETURNING count",
+            (key, amount, now + expiry, now, now)
+        ).fetchone()
+        
+        self._writes += 1
+        if self._writes % PURGE_EVERY == 0:
+            connection.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return row[0]
+    
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        with self._lock:
+            connection = self._connect()
+            try:
+                return self._incr(connection, key, expiry, amount, time.time())
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc):
+                    raise
+                logger.warning("Rate limit storage is busy, allowing request for %s", key)
+                return 0
+    
+    def get(self, key: str) -> int:
+        with self._lock:
+            return self._get(self._connect(), key, time.time())[0]
+    
+    def get_expiry(self, key: str) -> float:
+        with self._lock:
+            return self._get(self._connect(), key, time.time())[1]
+    
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+    
+    def reset(self) -> Optional[int]:
+        with self._lock:
+            return self._connect().execute("DELETE FROM rate_limits").rowcount
+    
+    def check(self) -> bool:
+        try:
+            with self._lock:
+                self._connect().execute("SELECT 1")
+            return True
+        except sqlite3.Error:
+            return False
+    
+    def _sliding_window(
+        self, connection: sqlite3.Connection, key: str, expiry: int, now: float
+    ) -> Tuple[str, int, float, int, float]:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(connection, previous_key, now)[0]
+        current_count = self._get(connection, current_key, now)[0]
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return current_key, previous_count, previous_ttl, current_count, current_ttl
+    
+    def acquire_sliding_window_entry(self, key: str, limit: int, expiry: int, amount: int = 1) -> bool:
+        if amount > limit:
+            return False
+        
+        now = time.time()
+        with self._lock:
+            connection = self._connect()
+            # BEGIN IMMEDIATE serialises the read-check-increment across workers
+            try:
+                connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as exc:
+                if not _is_busy(exc):
+                    raise
+                logger.warning("Rate limit storage is busy, allowing request for %s", key)
+                return True
+            try:
+                current_key, previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                    connection, key, expiry, now
+                )
+                weighted_count = previous_count * previous_ttl / expiry + current_count
+                acquired = floor(weighted_count) + amount <= limit
+                if acquired:
+                    self._incr(connection, current_key, 2 * expiry, amount, now)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return acquired
+    
+    def get_sliding_window(self, key: str, expiry: int) -> Tuple[int, float, int, float]:
+        with self._lock:
+            return self._sliding_window(self._connect(), key, expiry, time.time())[1:]
+    
+    def clear_sliding_window(self, key: str, expiry: int) -> None:
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self.clear(previous_key)
+        self.clear(current_key)
@@ -1,4 +1,10 @@
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+from config.settings import settings
+import utils.rate_limit_storage  # noqa: F401  (registers the sqlite:// storage scheme)
 
-limiter = Limiter(key_func=get_remote_address)
+limiter = Limiter(
+    key_func=get_remote_address,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    strategy=settings.RATE_LIMIT_STRATEGY,
+)
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from uuid import UUID
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from config.settings import settings
+from models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """This worker's copy of the revoked, not yet expired token ids.
+    
+    Membership is a single dict lookup on the request path. Entries are
+    dropped once their token expires, so the dict only ever holds tokens
+    that could still be presented.
+    """
+    
+    def __init__(self):
+        self._expiry: Dict[str, float] = {}
+        self.synced_at: Optional[datetime] = None
+    
+    def __contains__(self, jti: str) -> bool:
+        return jti in self._expiry
+    
+    def __len__(self) -> int:
+        return len(self._expiry)
+    
+    def add(self, jti: str, expires_at: float) -> None:
+        self._expiry[jti] = expires_at
+    
+    def prune(self, now: Optional[float] = None) -> None:
+        now = time.time() if now is None else now
+        self._expiry = {jti: exp for jti, exp in self._expiry.items() if exp > now}
+    
+    def clear(self) -> None:
+        self._expiry.clear()
+        self.synced_at = None
+
+
+revoked_tokens = RevocationList()
+
+
+def is_revoked(payload: Dict) -> bool:
+    """Whether a verified token has been revoked (tokens without a jti never are)."""
+    jti = payload.get("jti")
+    return jti is not None and jti in revoked_tokens
+
+
+async def revoke_token(db: AsyncSession, payload: Dict, user_id: UUID) -> None:
+    """Persist the revocation of a verified token in the current transaction."""
+    jti, exp = payload.get("jti"), payload.get("exp")
+    if jti is None or exp is None:
+        return
+    
+    now = datetime.utcnow()
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    await db.execute(
+        dialect.insert(RevokedToken)
+        .values(jti=jti, user_id=user_id, expires_at=datetime.utcfromtimestamp(exp), revoked_at=now)
+        .on_conflict_do_nothing(index_elements=[RevokedToken.jti])
+    )
+    # Expired tokens are rejected anyway; keep the table to live revocations
+    await db.execute(delete(RevokedToken).where(RevokedToken.expires_at < now))
+    
+    revoked_tokens.add(jti, exp)
+
+
+async def sync_revocations(db: AsyncSession) -> None:
+    """Load revocations made by other workers since the last sync.
+    
+    The first call loads every live revocation; later calls only read rows
+    revoked since the previous sync, overlapping by one interval so rows
+    committed late are not missed.
+    """
+    now = datetime.utcnow()
+    query = select(RevokedToken.jti, RevokedToken.expires_at)
+    if revoked_tokens.synced_at is None:
+        query = query.where(RevokedToken.expires_at > now)
+    else:
+        overlap = timedelta(seconds=settings.REVOCATION_SYNC_SECONDS)
+        query = query.where(RevokedToken.revoked_at >= revoked_tokens.synced_at - overlap)
+    
+    result = await db.execute(query)
+    for jti, expires_at in result:
+        revoked_tokens.add(jti, (expires_at - datetime(1970, 1, 1)).total_seconds())
+    
+    revoked_tokens.synced_at = now
+    revoked_tokens.prune()
+
+
+async def run_revocation_sync(session_factory: async_sessionmaker) -> None:
+    """Refresh this worker's revocation list every REVOCATION_SYNC_SECONDS."""
+    while True:
+        await asyncio.sleep(settings.REVOCATION_SYNC_SECONDS)
+        try:
+            async with session_factory() as session:
+                await sync_revocations(session)
+        except Exception:
+            logger.exception("Failed to refresh token revocations")
@@ -0,0 +1,59 @@
+import re
+from typing import Optional, Tuple
+from sqlalchemy import Float, Select, column, func, literal_column, or_, table
+from models.task import Task
+
+# Lightweight handles on the search structures created alongside the tasks table
+tasks_fts = table("tasks_fts", column("rowid"), column("rank", Float))
+search_vector = literal_column("tasks.search_vector")
+search_rowid = literal_column("tasks.search_rowid")
+
+
+def _fts5_query(search: str) -> str:
+    """Quote each word as an FTS5 prefix term so user input can't break the syntax."""
+    terms = []
+    for word in search.split():
+        terms.append('"' + word.replace('"', '""') + '"*')
+    return " ".join(terms)
+
+
+def _prefix_tsquery(search: str) -> str:
+    """AND every word of ``search`` as a to_tsquery prefix term, like _fts5_query.
+    
+    Only word characters are kept, so user input can't break the syntax.
+    """
+    return " & ".join(f"{word}:*" for word in re.findall(r"\w+", search))
+
+
+def apply_task_search(query: Select, search: str, dialect: str) -> Tuple[Select, Optional[object]]:
+    """Restrict a task query to rows matching ``search``.
+    
+    Returns the filtered query and a relevance expression where higher means
+    a better match, or ``None`` when the dialect has no search index.
+    """
+    if dialect == "postgresql":
+        prefix_query = _prefix_tsquery(search)
+        if not prefix_query:
+            return query, None
+        ts_query = func.to_tsquery("english", prefix_query)
+        query = query.where(search_vector.op("@@")(ts_query))
+        return query, func.ts_rank_cd(search_vector, ts_query, type_=Float)
+    
+    if dialect == "sqlite":
+        fts_query = _fts5_query(search)
+        if not fts_query:
+            return query, None
+        query = query.join(
+            tasks_fts, tasks_fts.c.rowid == search_rowid
+        ).where(literal_column("tasks_fts").match(fts_query))
+        return query, -tasks_fts.c.rank
+    
+    # No search index for this backend; fall back to substring matching
+    search_term = f"%{search}%"
+    query = query.where(
+        or_(
+            Task.title.ilike(search_term),
+            Task.description.ilike(search_term)
+        )
+    )
+    return query, None
@@ -0,0 +1,81 @@
+import codecs
+import csv
+from typing import AsyncIterator, Optional, Tuple, Union
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], max_length: int) -> AsyncIterator[Optional[str]]:
+    """Split a streamed UTF-8 body into lines without buffering the whole body.
+    
+    A line longer than ``max_length`` characters is discarded as it streams
+    in and yielded as ``None``, so one missing newline can't exhaust memory.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    pending = ""
+    oversized = False
+    
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if oversized or len(line) > max_length:
+                oversized = False
+                yield None
+            else:
+                yield line.removesuffix("\r")
+        if len(pending) > max_length:
+            oversized = True
+            pending = ""
+    
+    pending += decoder.decode(b"", final=True)
+    if oversized or len(pending) > max_length:
+        yield None
+    elif pending:
+        yield pending.removesuffix("\r")
+
+
+async def iter_csv_records(
+    lines: AsyncIterator[Optional[str]],
+    max_length: int
+) -> AsyncIterator[Tuple[int, Union[list[str], str]]]:
+    """Parse CSV records from streamed lines, yielding (line number, fields).
+    
+    Quoted fields may span lines; a record is complete once its quotes balance.
+    A record that can't be parsed, or grows past ``max_length`` characters
+    (e.g. after a stray quote), is yielded as an error message instead.
+    """
+    record = []
+    length = 0
+    quotes = 0
+    start = 0
+    line_number = 0
+    
+    async for line in lines:
+        line_number += 1
+        if not record:
+            start = line_number
+        
+        if line is None or length + len(line) > max_length:
+            yield start, "Record too long"
+            record, length, quotes = [], 0, 0
+            continue
+        
+        record.append(line)
+        length += len(line) + 1
+        quotes += line.count('"')
+        if quotes % 2:
+            continue
+        
+        text = "\n".join(record)
+        record, length, quotes = [], 0, 0
+        if text.strip():
+            yield start, _parse_csv_record(text)
+    
+    if record:
+        yield start, _parse_csv_record("\n".join(record))
+
+
+def _parse_csv_record(text: str) -> Union[list[str], str]:
+    try:
+        return next(csv.reader([text]))
+    except csv.Error as exc:
+        return f"Invalid CSV: {exc}"
@@ -0,0 +1,104 @@
+from collections import Counter
+from typing import Any, Mapping, Optional
+from uuid import UUID
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from models.task import Task
+from models.task_stat import TaskStat
+
+# Key used for tasks without a category
+NO_CATEGORY = "none"
+
+
+def _stat_key(dimension: str, value: Any) -> str:
+    if dimension == "category":
+        return str(value) if value else NO_CATEGORY
+    return getattr(value, "value", value)
+
+
+def task_stat_keys(status: Any, priority: Any, category_id: Optional[UUID]) -> list[tuple[str, str]]:
+    """Counter keys a task with these attributes contributes to."""
+    return [
+        ("status", _stat_key("status", status)),
+        ("priority", _stat_key("priority", priority)),
+        ("category", _stat_key("category", category_id)),
+    ]
+
+
+def add_task(deltas: Counter, status: Any, priority: Any, category_id: Optional[UUID]) -> None:
+    for key in task_stat_keys(status, priority, category_id):
+        deltas[key] += 1
+
+
+def remove_task(deltas: Counter, status: Any, priority: Any, category_id: Optional[UUID]) -> None:
+    for key in task_stat_keys(status, priority, category_id):
+        deltas[key] -= 1
+
+
+async def apply_task_stat_deltas(db: AsyncSession, user_id: UUID, deltas: Mapping) -> None:
+    """Add ``deltas`` to the user's counters with one upsert statement.
+    
+    Runs in the caller's transaction so counters commit with the task write.
+    Keys are sorted so concurrent writers lock counter rows in the same order.
+    """
+    rows = [
+        {"user_id": user_id, "dimension": dimension, "key": key, "count": delta}
+        for (dimension, key), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return
+    
+    dialect = postgresql if db.bind.dialect.name == "postgresql" else sqlite
+    stmt = dialect.insert(TaskStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TaskStat.user_id, TaskStat.dimension, TaskStat.key],
+        set_={"count": TaskStat.count + stmt.excluded.count}
+    )
+    await db.execute(stmt)
+
+
+async def get_task_stats(db: AsyncSession, user_id: UUID) -> dict[str, dict[str, int]]:
+    """Read the user's counters grouped by dimension."""
+    result = await db.execute(
+        select(TaskStat.dimension, TaskStat.key, TaskStat.count)
+        .where(TaskStat.user_id == user_id, TaskStat.count != 0)
+    )
+    stats: dict[str, dict[str, int]] = {"status": {}, "priority": {}, "category": {}}
+    for dimension, key, count in result.all():
+        stats.setdefault(dimension, {})[key] = count
+    return stats
+
+
+async def rebuild_task_stats(db: AsyncSession, user_id: Optional[UUID] = None) -> None:
+    """Recompute counters from the tasks table to repair drift.
+    
+    Rebuilds one user's counters, or everyone's when ``user_id`` is None.
+    """
+    clear = delete(TaskStat)
+    if user_id is not None:
+        clear = clear.where(TaskStat.user_id == user_id)
+    await db.execute(clear)
+    
+    groupings = [
+        ("status", Task.status),
+        ("priority", Task.priority),
+        ("category", Task.category_id),
+    ]
+    for dimension, column in groupings:
+        query = select(Task.user_id, column, func.count()).group_by(Task.user_id, column)
+        if user_id is not None:
+            query = query.where(Task.user_id == user_id)
+        result = await db.execute(query)
+        rows = [
+            {
+                "user_id": row_user_id,
+                "dimension": dimension,
+                "key": _stat_key(dimension, value),
+                "count": count,
+            }
+            for row_user_id, value, count in result.all()
+        ]
+        if rows:
+            await db.execute(TaskStat.__table__.insert(), rows)
@@ -0,0 +1,118 @@
+import math
+import time
+from typing import Dict, Optional, Tuple
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+from config.settings import settings
+from core.security import decode_token
+from utils.cache import TTLCache
+
+# Tokens charged per request for routes that do more work than a plain read
+ROUTE_COSTS: Dict[Tuple[str, str], int] = {
+    ("POST", f"{settings.API_V1_PREFIX}/tasks/batch"): 10,
+    ("POST", f"{settings.API_V1_PREFIX}/tasks/import"): 20,
+    ("GET", f"{settings.API_V1_PREFIX}/tasks/export"): 10,
+}
+
+
+class TokenBucketLimiter:
+    """Per-client token buckets refilled continuously at ``rate`` tokens/second.
+    
+    Buckets are [tokens, last refill] pairs in a bounded LRU. Every acquire
+    re-stores the bucket, so it expires only once it has been idle long
+    enough to refill completely, when it is indistinguishable from a new one.
+    """
+    
+    def __init__(self, per_minute: int, burst: int, max_clients: int):
+        self.configure(per_minute, burst)
+        self._buckets = TTLCache(maxsize=max_clients, ttl=self.capacity / self.rate)
+    
+    def configure(self, per_minute: int, burst: int) -> None:
+        self.rate = per_minute / 60.0
+        self.capacity = float(burst)
+    
+    def acquire(self, key: str, cost: int = 1) -> float:
+        """Take ``cost`` tokens; return 0 on success or the seconds to wait.
+        
+        A cost above the bucket size is charged as a full bucket.
+        """
+        cost = min(cost, self.capacity)
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.capacity, now]
+        else:
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        # Restart the expiry from this refill
+        self._buckets.set(key, bucket)
+        
+        if bucket[0] >= cost:
+            bucket[0] -= cost
+            return 0.0
+        return (cost - bucket[0]) / self.rate
+    
+    def reset(self) -> None:
+        self._buckets.clear()
+
+
+api_rate_limiter = TokenBucketLimiter(
+    per_minute=settings.RATE_LIMIT_PER_MINUTE,
+    burst=settings.RATE_LIMIT_BURST or settings.RATE_LIMIT_PER_MINUTE,
+    max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+)
+
+
+def _client_key(scope: Scope) -> str:
+    """The user id from a valid bearer token, else the client address."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token:
+                # Verified claims come from the token cache after the first use
+                payload = decode_token(token)
+                if payload is not None and payload.get("sub"):
+                    return "user:" + payload["sub"]
+            break
+    
+    client = scope.get("client")
+    return "ip:" + (client[0] if client else "unknown")
+
+
+class RateLimitMiddleware:
+    """Apply per-user token buckets to every API route.
+    
+    Buckets live in each worker's memory, so a check costs a dict lookup and
+    some arithmetic; with several workers the effective limit scales with
+    their number. Routes in ROUTE_COSTS take more than one token.
+    """
+    
+    def __init__(
+        self,
+        app: ASGIApp,
+        limiter: TokenBucketLimiter = api_rate_limiter,
+        prefix: str = settings.API_V1_PREFIX,
+        route_costs: Optional[Dict[Tuple[str, str], int]] = None,
+    ):
+        self.app = app
+        self.limiter = limiter
+        self.prefix = prefix
+        self.route_costs = ROUTE_COSTS if route_costs is None else route_costs
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.prefix):
+            await self.app(scope, receive, send)
+            return
+        
+        cost = self.route_costs.get((scope["method"], scope["path"]), 1)
+        retry_after = self.limiter.acquire(_client_key(scope), cost)
+        if retry_after:
+            response = JSONResponse(
+                {"detail": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+            await response(scope, receive, send)
+            return
+        
+        await self.app(scope, receive, send)
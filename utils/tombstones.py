@@ -0,0 +1,37 @@
+from datetime import datetime, timedelta
+from typing import Iterable
+from uuid import UUID
+from sqlalchemy import insert, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from config.settings import settings
+from models.tombstone import Tombstone
+
+
+def retention_horizon(now: datetime) -> datetime:
+    """Oldest point in time for which deletions are still on record."""
+    return now - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+
+
+async def record_tombstones(
+    db: AsyncSession,
+    user_id: UUID,
+    entity_type: str,
+    entity_ids: Iterable[UUID]
+) -> None:
+    """Record deletions in the current transaction and expire old records."""
+    now = datetime.utcnow()
+    rows = [
+        {"user_id": user_id, "entity_type": entity_type, "entity_id": entity_id, "deleted_at": now}
+        for entity_id in entity_ids
+    ]
+    if not rows:
+        return
+    
+    await db.execute(insert(Tombstone), rows)
+    # Bounded retention: an index range delete that is usually a no-op
+    await db.execute(
+        delete(Tombstone).where(
+            Tombstone.user_id == user_id,
+            Tombstone.deleted_at < retention_horizon(now)
+        )
+    )
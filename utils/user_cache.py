@@ -0,0 +1,88 @@
+from typing import Any, Dict, Optional
+from uuid import UUID
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from config.settings import settings
+from models.user import User
+from utils.cache import TTLCache
+
+# user_id -> column values of the user row, as loaded by get_current_user
+_users = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_ENTRIES,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+# Bumped by every invalidation. A load that overlaps one is not cached, since
+# it may have read the row before the change committed.
+_generation = 0
+
+# Session.info key collecting users to invalidate again once the write commits
+PENDING_KEY = "invalidate_users"
+
+
+def user_cache_generation() -> int:
+    """Token to pass to cache_user for a load started now."""
+    return _generation
+
+
+def get_cached_user(user_id: UUID) -> Optional[User]:
+    """Return a detached copy of the cached user, or None on a miss."""
+    values = _users.get(user_id)
+    if values is None:
+        return None
+    
+    user = User(**values)
+    make_transient_to_detached(user)
+    return user
+
+
+def cache_user(user: User, generation: int) -> None:
+    """Remember a freshly loaded user unless it was invalidated meanwhile."""
+    if generation != _generation:
+        return
+    
+    # data_version is left out: other workers bump it without invalidating
+    # this cache, so callers read it with utils.versioning.get_data_version
+    values: Dict[str, Any] = {
+        attr.key: getattr(user, attr.key)
+        for attr in inspect(User).column_attrs
+        if attr.key != "data_version"
+    }
+    _users.set(user.id, values)
+
+
+def invalidate_user(user_id: UUID, session: Optional[Session] = None) -> None:
+    """Drop a user from the cache after their row changes or is deleted.
+    
+    Pass the session making the change to invalidate again when it commits,
+    so a concurrent request cannot re-cache the old row in between.
+    """
+    global _generation
+    _generation += 1
+    _users.pop(user_id)
+    
+    if session is not None:
+        session.info.setdefault(PENDING_KEY, set()).add(user_id)
+
+
+def user_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and current size of the user cache."""
+    return {"hits": _users.hits, "misses": _users.misses, "size": len(_users)}
+
+
+def clear_user_cache() -> None:
+    """Forget every cached user."""
+    global _generation
+    _generation += 1
+    _users.clear()
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    for user_id in session.info.pop(PENDING_KEY, ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_users(session: Session) -> None:
+    session.info.pop(PENDING_KEY, None)
@@ -0,0 +1,55 @@
+import hashlib
+from typing import Optional
+from uuid import UUID
+from fastapi import Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from core.exceptions import AuthenticationException
+from models.user import User
+
+# Clients may reuse cached bodies but must revalidate them on every request
+CACHE_CONTROL = "private, no-cache"
+
+
+async def bump_data_version(db: AsyncSession, user_id: UUID) -> None:
+    """Mark the user's data as changed in the current transaction."""
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
+
+
+async def get_data_version(db: AsyncSession, user_id: UUID) -> int:
+    """Read the user's data version from the database.
+    
+    The cached user row is per worker and misses bumps made by other
+    workers, so ETags and count-cache keys must not use it.
+    """
+    result = await db.execute(select(User.data_version).where(User.id == user_id))
+    data_version = result.scalar_one_or_none()
+    if data_version is None:
+        raise AuthenticationException("User not found")
+    return data_version
+
+
+def compute_etag(user_id: UUID, data_version: int, request: Request) -> str:
+    """Derive an ETag from the user's data version and the request URL."""
+    params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    source = f"{user_id}:{data_version}:{request.url.path}?{params}"
+    return '"' + hashlib.sha1(source.encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def check_etag(user_id: UUID, data_version: int, request: Request, response: Response) -> Optional[Response]:
+    """Set the ETag on ``response``, or return a 304 if the client's copy is current."""
+    etag = compute_etag(user_id, data_version, request)
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    response.headers.update(headers)
+    return None